@@ -0,0 +1,98 @@
+from bisect import bisect_right
+from shunting_yard import label_ranges
+
+
+def class_name(ranges) -> str:
+    """
+    Nombre canónico de una clase: el carácter si es uno solo, si no '[...]'.
+    El '-' literal se escribe primero para que el nombre pueda volver a parsearse.
+    """
+    if len(ranges) == 1 and ranges[0][0] == ranges[0][1]:
+        return ranges[0][0]
+    dash = False
+    parts = []
+    for lo, hi in ranges:
+        if lo <= '-' <= hi:
+            dash = True
+            if lo < '-':
+                parts.append((lo, chr(ord('-') - 1)))
+            if '-' < hi:
+                parts.append((chr(ord('-') + 1), hi))
+        else:
+            parts.append((lo, hi))
+    body = ''.join(lo if lo == hi else f'{lo}{hi}' if ord(hi) == ord(lo) + 1 else f'{lo}-{hi}' for lo, hi in parts)
+    return '[' + ('-' if dash else '') + body + ']'
+
+
+class SymbolClasses:
+    """
+    Partición del alfabeto en clases de equivalencia: dos caracteres están en
+    la misma clase si ninguna etiqueta del autómata los distingue.
+    Cada clase se identifica por su nombre canónico (ver class_name).
+    """
+
+    def __init__(self, labels):
+        labels = sorted(set(labels))
+        # Puntos de corte de todos los rangos de todas las etiquetas
+        events = []
+        for label in labels:
+            for lo, hi in label_ranges(label):
+                events.append((ord(lo), ord(hi) + 1, label))
+        cuts = sorted({p for lo, end, _ in events for p in (lo, end)})
+
+        # Firma (conjunto de etiquetas que lo cubren) de cada segmento elemental
+        signatures = [set() for _ in cuts]
+        for lo, end, label in events:
+            for k in range(bisect_right(cuts, lo) - 1, bisect_right(cuts, end - 1)):
+                signatures[k].add(label)
+
+        # Segmentos con la misma firma forman una misma clase
+        by_signature = {}
+        for k, signature in enumerate(signatures[:-1]):
+            if signature:
+                segment = (chr(cuts[k]), chr(cuts[k + 1] - 1))
+                by_signature.setdefault(frozenset(signature), []).append((k, segment))
+
+        self.names = []
+        self.representatives = {}   # nombre -> un carácter de la clase
+        self.label_classes = {label: [] for label in labels}
+        self._starts = cuts
+        self._segment_class = [None] * len(cuts)
+        for signature, segments in by_signature.items():
+            ranges = _merge([segment for _, segment in segments])
+            name = class_name(ranges)
+            self.names.append(name)
+            self.representatives[name] = ranges[0][0]
+            for k, _ in segments:
+                self._segment_class[k] = name
+            for label in signature:
+                self.label_classes[label].append(name)
+
+    def classify(self, ch: str):
+        """Nombre de la clase del carácter, o None si no pertenece al alfabeto"""
+        k = bisect_right(self._starts, ord(ch)) - 1
+        return self._segment_class[k] if k >= 0 else None
+
+    def boundaries(self) -> tuple:
+        """(inicios, clases): el segmento k cubre [inicios[k], inicios[k+1]) y su clase es clases[k]"""
+        return self._starts, self._segment_class
+
+    def __len__(self):
+        return len(self.names)
+
+
+def _merge(ranges) -> list:
+    ranges = sorted(ranges)
+    merged = [ranges[0]]
+    for lo, hi in ranges[1:]:
+        if ord(lo) == ord(merged[-1][1]) + 1:
+            merged[-1] = (merged[-1][0], hi)
+        else:
+            merged.append((lo, hi))
+    return merged
+
+
+def alphabet_classes(nfa) -> SymbolClasses:
+    """Clases de equivalencia del alfabeto de un NFA"""
+    from subset import get_alphabet
+    return SymbolClasses(get_alphabet(nfa))
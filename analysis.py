@@ -0,0 +1,163 @@
+"""
+Análisis del lenguaje de un DFA en tiempo polinomial.
+
+Las palabras se forman con los caracteres del alfabeto del DFA; un símbolo
+que es una clase '[...]' aporta todos sus caracteres. Las palabras
+rechazadas se buscan en el complemento respecto de ese mismo alfabeto.
+"""
+from itertools import islice
+from math import log2
+from shunting_yard import label_chars
+from dfa import DFA
+
+DEAD = None  # Sumidero implícito para las transiciones ausentes
+
+
+class _Graph:
+    """Estados alcanzables desde el inicio (con DEAD si hace falta) y sus transiciones"""
+    __slots__ = ('start', 'symbols', 'chars', 'delta', 'finals')
+
+    def __init__(self, dfa: DFA, rejected: bool = False):
+        self.chars = {symbol: label_chars(symbol) for symbol in dfa.alphabet}
+        # Orden por el menor carácter de cada símbolo: las palabras salen en orden lexicográfico
+        self.symbols = sorted(dfa.alphabet, key=lambda symbol: self.chars[symbol][0])
+        self.start = dfa.start
+        self.delta = {}
+        stack = [dfa.start]
+        while stack:
+            state = stack.pop()
+            if state in self.delta:
+                continue
+            row = dfa.transitions.get(state, {}) if state is not DEAD else {}
+            self.delta[state] = {symbol: row.get(symbol, DEAD) for symbol in self.symbols}
+            stack.extend(self.delta[state].values())
+        self.finals = {state for state in self.delta if (state is not DEAD and state in dfa.accepts) != rejected}
+
+    def predecessors(self, targets: set) -> set:
+        return {state for state, row in self.delta.items() if any(t in targets for t in row.values())}
+
+
+def _shortest(graph: _Graph):
+    parent = {graph.start: None}
+    queue = [graph.start]
+    for state in queue:  # BFS: la cola crece mientras se recorre
+        if state in graph.finals:
+            word = []
+            while parent[state] is not None:
+                state, ch = parent[state]
+                word.append(ch)
+            return ''.join(reversed(word))
+        for symbol in graph.symbols:
+            target = graph.delta[state][symbol]
+            if target not in parent:
+                parent[target] = (state, graph.chars[symbol][0])
+                queue.append(target)
+    return None
+
+
+def shortest_accepted(dfa: DFA):
+    """La palabra aceptada más corta (la menor lexicográficamente), o None si el lenguaje es vacío"""
+    return _shortest(_Graph(dfa))
+
+
+def shortest_rejected(dfa: DFA):
+    """La palabra rechazada más corta sobre el alfabeto, o None si se aceptan todas"""
+    return _shortest(_Graph(dfa, rejected=True))
+
+
+def _enumerate(graph: _Graph, max_length):
+    # Caracteres en orden, cada uno con su símbolo
+    members = sorted((ch, symbol) for symbol in graph.symbols for ch in graph.chars[symbol])
+    live = set(graph.finals)
+    frontier = set(graph.finals)
+    while frontier:
+        frontier = graph.predecessors(frontier) - live
+        live |= frontier
+
+    ready = [graph.finals]  # ready[k]: estados desde los que se acepta en exactamente k pasos
+    layer = {graph.start}   # estados alcanzables en exactamente `length` pasos
+    length = 0
+    while layer & live and (max_length is None or length <= max_length):
+        while len(ready) <= length:
+            ready.append(graph.predecessors(ready[-1]))
+        if graph.start in ready[length]:
+            # DFS en orden de caracteres, entrando solo a estados que aún pueden aceptar
+            stack = [(graph.start, '')]
+            while stack:
+                state, prefix = stack.pop()
+                remaining = length - len(prefix)
+                if remaining == 0:
+                    yield prefix
+                    continue
+                row = graph.delta[state]
+                for ch, symbol in reversed(members):
+                    if row[symbol] in ready[remaining - 1]:
+                        stack.append((row[symbol], prefix + ch))
+        layer = {graph.delta[state][symbol] for state in layer for symbol in graph.symbols}
+        length += 1
+
+
+def accepted_words(dfa: DFA, max_length: int | None = None):
+    """Generador de las palabras aceptadas en orden longitud-lexicográfico"""
+    return _enumerate(_Graph(dfa), max_length)
+
+
+def rejected_words(dfa: DFA, max_length: int | None = None):
+    """Generador de las palabras rechazadas (sobre el alfabeto) en orden longitud-lexicográfico"""
+    return _enumerate(_Graph(dfa, rejected=True), max_length)
+
+
+def _count_dp(graph: _Graph, weights: dict, n: int) -> int:
+    ways = {graph.start: 1}
+    for _ in range(n):
+        following = {}
+        for state, count in ways.items():
+            for symbol, target in graph.delta[state].items():
+                following[target] = following.get(target, 0) + count * weights[symbol]
+        ways = following
+    return sum(count for state, count in ways.items() if state in graph.finals)
+
+
+def _count_matrix(graph: _Graph, weights: dict, n: int) -> int:
+    index = {state: i for i, state in enumerate(graph.delta)}
+    size = len(index)
+    matrix = [[0] * size for _ in range(size)]
+    for state, row in graph.delta.items():
+        for symbol, target in row.items():
+            matrix[index[state]][index[target]] += weights[symbol]
+
+    def multiply(a, b):
+        return [[sum(a_ik * b_k[j] for a_ik, b_k in zip(a_i, b) if a_ik) for j in range(size)] for a_i in a]
+
+    vector = [[1 if state == graph.start else 0 for state in index]]
+    while n:
+        if n & 1:
+            vector = multiply(vector, matrix)
+        matrix = multiply(matrix, matrix)
+        n >>= 1
+    return sum(vector[0][index[state]] for state in graph.finals)
+
+
+def count_accepted(dfa: DFA, n: int, method: str = 'auto') -> int:
+    """
+    Cantidad de palabras aceptadas de longitud n; cada clase cuenta tantas
+    veces como caracteres tiene. method: 'dp' (O(n·|δ|)), 'matrix'
+    (exponenciación, O(m³·log n)) o 'auto' (el más barato de ambos).
+    """
+    if n < 0:
+        raise ValueError(f"Longitud inválida: {n}")
+    if method not in {'auto', 'dp', 'matrix'}:
+        raise ValueError(f"Método no soportado: {method}")
+    graph = _Graph(dfa)
+    weights = {symbol: len(chars) for symbol, chars in graph.chars.items()}
+    if method == 'auto':
+        size = len(graph.delta)
+        method = 'matrix' if n > 1 and size ** 3 * log2(n) < n * size * max(len(weights), 1) else 'dp'
+    if method == 'matrix':
+        return _count_matrix(graph, weights, n)
+    return _count_dp(graph, weights, n)
+
+
+def validation_strings(dfa: DFA, limit: int = 5) -> list:
+    """Hasta `limit` palabras aceptadas y `limit` rechazadas, las más cortas primero"""
+    return list(islice(accepted_words(dfa), limit)) + list(islice(rejected_words(dfa), limit))
@@ -0,0 +1,49 @@
+"""
+API de biblioteca sobre cadenas en memoria.
+
+    import api
+    p = api.compile('(a|b)*abb')
+    api.match(p, 'aabb')          # True
+    api.search('ab+', 'xxabbbyab') # [(2, 6), (7, 9)]
+
+Los patrones compilados se guardan en el caché LRU de pattern_cache, así que
+pasar la misma expresión como texto repetidas veces no recompila. Las
+dependencias opcionales (graphviz, numpy) solo se importan al renderizar o al
+usar vectorized.
+"""
+from pattern_cache import CompiledPattern, compile as _compile
+
+
+def compile(regex: str, engine: str = 'thompson') -> CompiledPattern:
+    """Compila regex ('thompson' o 'followpos') y devuelve el patrón en caché"""
+    return _compile(regex, engine)
+
+
+def _pattern(pattern, engine: str) -> CompiledPattern:
+    return pattern if isinstance(pattern, CompiledPattern) else _compile(pattern, engine)
+
+
+def match(pattern, text: str, engine: str = 'thompson') -> bool:
+    """True si text completo pertenece al lenguaje del patrón"""
+    return _pattern(pattern, engine).accepts_string(text)
+
+
+def search(pattern, text, engine: str = 'thompson') -> list:
+    """Coincidencias (inicio, fin) no solapadas, más a la izquierda y más largas"""
+    return _pattern(pattern, engine).search(text)
+
+
+def to_dot(pattern, kind: str = 'minimized', engine: str = 'thompson') -> str:
+    """Fuente DOT de una etapa del patrón: 'ast', 'nfa', 'dfa' o 'minimized'"""
+    from render import ast_to_dot, nfa_to_dot, dfa_to_dot
+
+    pattern = _pattern(pattern, engine)
+    if kind == 'ast':
+        return ast_to_dot(pattern.ast)
+    if kind == 'nfa':
+        return nfa_to_dot(pattern.nfa)
+    if kind == 'dfa':
+        return dfa_to_dot(pattern.dfa)
+    if kind == 'minimized':
+        return dfa_to_dot(pattern.minimized)
+    raise ValueError(f"Etapa no soportada: {kind}")
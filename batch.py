@@ -0,0 +1,56 @@
+import os
+from collections import deque
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
+from pattern_cache import compile as compile_regex
+
+
+def iter_lines(path: str):
+    """Lee un archivo línea por línea sin cargarlo completo en memoria"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            yield line.strip()
+
+
+def process_expression(regex: str, w: str | None = None, engine: str = 'thompson') -> dict:
+    """Pipeline completo para una expresión (sin renderizado); se ejecuta en un proceso hijo"""
+    pattern = compile_regex(regex, engine)
+    result = {
+        'regex': regex,
+        'postfix': pattern.postfix,
+        # Con followpos no se construye el NFA solo para informar su tamaño
+        'nfa_states': len(pattern.nfa.states()) if pattern.engine == 'thompson' else None,
+        'dfa_states': len(pattern.dfa.states),
+        'minimized_states': len(pattern.minimized.states),
+        'word': w,
+        'accepted': None,
+    }
+    if w is not None:
+        result['accepted'] = pattern.accepts_string(w)
+    return result
+
+
+def _process_task(task):
+    return process_expression(*task)
+
+
+def batch_process(regexes, words=None, workers: int | None = None, window: int | None = None, engine: str = 'thompson'):
+    """
+    Reparte el pipeline de cada expresión en un ProcessPoolExecutor.
+    Las expresiones y palabras se consumen de forma perezosa (a lo sumo
+    `window` tareas pendientes) y los resultados se generan en el orden de entrada.
+    """
+    workers = workers or os.cpu_count() or 1
+    window = window or workers * 4
+    if words is None:
+        words = repeat(None)
+    tasks = ((r, w, engine) for r, w in zip(regexes, words))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for task in tasks:
+            pending.append(executor.submit(_process_task, task))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
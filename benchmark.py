@@ -0,0 +1,175 @@
+"""
+Suite de benchmarks reproducible con familias de expresiones parametrizadas.
+
+Cada familia estresa una etapa distinta y se mide para n creciente:
+  dfa_blowup   (a|b)*a(a|b){n}        -> explosión de la construcción de subconjuntos
+  nested_plus  ((a+b)+b)+...          -> expand_regex y el parser
+  alternation  ab|ac|...|(n términos) -> construcción de Thompson
+  wide_alternation  (ā|ă|...) con n caracteres distintos -> subconjuntos con NFA grande
+  deep_nesting ((((a)*)*)*)* con n niveles -> cierres ε profundos
+  long_words   (0|1)*0(0|1)(0|1)      -> simulación sobre palabras de longitud n
+
+Las etapas (expand, parse, nfa, subset, minimize, match) se miden por separado,
+tomando el mínimo de varias repeticiones. Los resultados se guardan en JSON y
+pueden compararse contra una línea base anterior:
+
+    python benchmark.py --out bench.json
+    python benchmark.py --out nuevo.json --compare bench.json
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+from time import perf_counter
+from shunting_yard import expand_regex, infix_to_postfix, postfix_to_ast
+from thompson import thompson_from_ast
+from subset import subset_construction
+from dfa import minimize_dfa
+
+
+def dfa_blowup(n: int) -> str:
+    return '(a|b)*a' + '(a|b)' * n
+
+
+def nested_plus(n: int) -> str:
+    regex = 'a'
+    for _ in range(n):
+        regex = f'({regex}+b)'
+    return regex + '+'
+
+
+def alternation(n: int) -> str:
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    terms = [letters[i // 26 % 26] + letters[i % 26] for i in range(n)]
+    return '(' + '|'.join(terms) + ')'
+
+
+def wide_alternation(n: int) -> str:
+    return '(' + '|'.join(chr(0x100 + i) for i in range(n)) + ')'
+
+
+def deep_nesting(n: int) -> str:
+    return '(' * n + 'a' + ')*' * n
+
+
+def long_words(n: int) -> str:
+    return '(0|1)*0(0|1)(0|1)'
+
+
+FAMILIES = {
+    'dfa_blowup': (dfa_blowup, [2, 4, 6, 8, 10, 12], 'ab'),
+    'nested_plus': (nested_plus, [2, 4, 6, 8, 10], 'ab'),
+    'alternation': (alternation, [10, 50, 100, 200, 400], 'abcdefghijklmnopqrstuvwxyz'),
+    'wide_alternation': (wide_alternation, [250, 500, 1000, 2000], ''.join(chr(0x100 + i) for i in range(64))),
+    'deep_nesting': (deep_nesting, [250, 500, 1000, 3000], 'ab'),
+    'long_words': (long_words, [100, 1000, 10000, 100000], '01'),
+}
+
+
+def _best(fn, repeats: int):
+    """Ejecuta fn varias veces; devuelve (mejor tiempo, último resultado)"""
+    best, result = None, None
+    for _ in range(repeats):
+        start = perf_counter()
+        result = fn()
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run_case(family: str, n: int, repeats: int, rng: random.Random, words: int = 200) -> dict:
+    build, _, alphabet = FAMILIES[family]
+    regex = build(n)
+    timings = {}
+
+    # expand_regex es exponencial en el anidamiento de '+': solo se mide en esa familia
+    if family == 'nested_plus':
+        timings['expand'], _ = _best(lambda: expand_regex(regex), repeats)
+    timings['parse'], ast = _best(lambda: postfix_to_ast(infix_to_postfix(regex)), repeats)
+    timings['nfa'], nfa = _best(lambda: thompson_from_ast(ast), repeats)
+    timings['subset'], dfa = _best(lambda: subset_construction(nfa), repeats)
+    timings['minimize'], minimized = _best(lambda: minimize_dfa(dfa), repeats)
+
+    length = n if family == 'long_words' else 32
+    samples = [''.join(rng.choice(alphabet) for _ in range(length)) for _ in range(words)]
+    compiled = minimized.compile()
+    timings['match'], _ = _best(lambda: [compiled.accepts_string(w) for w in samples], repeats)
+
+    return {
+        'family': family,
+        'n': n,
+        'regex_length': len(regex),
+        'nfa_states': len(nfa.states()),
+        'dfa_states': len(dfa.states),
+        'minimized_states': len(minimized.states),
+        'seconds': timings,
+    }
+
+
+def run(families=None, repeats: int = 3, seed: int = 0, max_n: int | None = None) -> dict:
+    rng = random.Random(seed)
+    results = []
+    for family in families or FAMILIES:
+        for n in FAMILIES[family][1]:
+            if max_n is not None and n > max_n:
+                continue
+            results.append(run_case(family, n, repeats, rng))
+    return {
+        'meta': {
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'seed': seed,
+            'repeats': repeats,
+        },
+        'results': results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float = 1.25) -> list:
+    """Devuelve (familia, n, etapa, razón) de las etapas más lentas que la línea base"""
+    previous = {(r['family'], r['n']): r['seconds'] for r in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        old = previous.get((result['family'], result['n']))
+        if old is None:
+            continue
+        for stage, seconds in result['seconds'].items():
+            if old.get(stage) and seconds / old[stage] > threshold:
+                regressions.append((result['family'], result['n'], stage, seconds / old[stage]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks del pipeline regex -> DFA")
+    parser.add_argument('--families', nargs='*', choices=sorted(FAMILIES), help="familias a medir (todas por defecto)")
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-n', type=int, default=None, help="omitir tamaños mayores que este")
+    parser.add_argument('--out', default='bench.json', help="archivo JSON de resultados")
+    parser.add_argument('--compare', default=None, help="línea base JSON contra la que comparar")
+    parser.add_argument('--threshold', type=float, default=1.25, help="razón a partir de la cual se reporta una regresión")
+    args = parser.parse_args(argv)
+
+    report = run(args.families, args.repeats, args.seed, args.max_n)
+    for result in report['results']:
+        stages = ', '.join(f"{stage}={seconds * 1000:.2f}ms" for stage, seconds in result['seconds'].items())
+        print(f"{result['family']:<16} n={result['n']:<6} DFA={result['dfa_states']:<6} {stages}")
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Resultados guardados en {args.out}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for family, n, stage, ratio in regressions:
+            print(f"Regresión: {family} n={n} {stage} x{ratio:.2f}")
+        if not regressions:
+            print("Sin regresiones respecto a la línea base")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,14 +1,17 @@
-from graphviz import Digraph
 from thompson import NFA
 from simulaciones import epsilon_closure, move
 from collections import defaultdict
+from array import array
+from types import MappingProxyType
+from profiling import PROFILER
 
 class DFA:
-    def __init__(self, start, accepts, transitions, alphabet):
+    def __init__(self, start, accepts, transitions, alphabet, classes=None):
         self.start = start
         self.accepts = set(accepts)
         self.transitions = transitions  # dict: state -> dict: symbol -> state
         self.alphabet = alphabet
+        self.classes = classes  # SymbolClasses: carácter -> clase (None = símbolos literales)
         self.states = set(transitions.keys())
     
     def states(self):
@@ -17,7 +20,10 @@ class DFA:
     def accepts_string(self, w: str) -> bool:
         """Simula el DFA con una cadena de entrada"""
         current = self.start
+        classify = self.classes.classify if self.classes is not None else None
         for symbol in w:
+            if classify is not None:
+                symbol = classify(symbol)
             if symbol not in self.alphabet:
                 return False  # Símbolo no está en el alfabeto
             if current not in self.transitions or symbol not in self.transitions[current]:
@@ -25,9 +31,133 @@ class DFA:
             current = self.transitions[current][symbol]
         return current in self.accepts
 
+    def compile(self) -> 'CompiledDFA':
+        """Compila el DFA a una tabla de transiciones densa"""
+        return CompiledDFA(self)
+
+
+def reachable_states(dfa: DFA) -> set:
+    """Estados alcanzables desde el estado inicial"""
+    seen = {dfa.start}
+    stack = [dfa.start]
+    while stack:
+        state = stack.pop()
+        for target in dfa.transitions.get(state, {}).values():
+            if target not in seen:
+                seen.add(target)
+                stack.append(target)
+    return seen
+
+
+def coreachable_states(dfa: DFA) -> set:
+    """Estados desde los que todavía se puede llegar a un estado de aceptación"""
+    inverse = defaultdict(list)
+    for state, row in dfa.transitions.items():
+        for target in row.values():
+            inverse[target].append(state)
+    seen = set(dfa.accepts)
+    stack = list(seen)
+    while stack:
+        state = stack.pop()
+        for source in inverse[state]:
+            if source not in seen:
+                seen.add(source)
+                stack.append(source)
+    return seen
+
+
+def trim_dfa(dfa: DFA) -> DFA:
+    """
+    Elimina los estados inútiles (inalcanzables o sin camino a aceptación)
+    y las transiciones hacia ellos. El estado inicial se conserva siempre.
+    """
+    useful = reachable_states(dfa) & coreachable_states(dfa)
+    transitions = {
+        state: {symbol: target for symbol, target in row.items() if target in useful}
+        for state, row in dfa.transitions.items() if state in useful
+    }
+    transitions.setdefault(dfa.start, {})
+    return DFA(
+        start=dfa.start,
+        accepts=dfa.accepts & useful,
+        transitions=transitions,
+        alphabet=dfa.alphabet,
+        classes=dfa.classes
+    )
+
+
+class CompiledDFA:
+    """
+    DFA compilado a una tabla plana array('i') de tamaño (n + 1) * columnas.
+    Solo se conservan los estados útiles, renumerados de 0 a n - 1; el estado n
+    es el sumidero canónico (dead): toda transición a una región desde la que
+    no se puede aceptar va a él, así que llegar a dead permite rechazar de inmediato.
+    La última columna corresponde a los símbolos fuera del alfabeto.
+    cols va de símbolo a columna; con clases de equivalencia, un carácter que
+    no es por sí solo un símbolo se clasifica con classes.classify (ver column).
+    Es inmutable, por lo que puede compartirse entre hilos.
+    """
+    __slots__ = ('symbols', 'classes', 'cols', 'ncols', 'states', 'start', 'dead', 'table', 'accepting')
+
+    def __init__(self, dfa: DFA):
+        symbols = tuple(sorted(dfa.alphabet))
+        states = tuple(sorted(reachable_states(dfa) & coreachable_states(dfa)))
+        index = {state: i for i, state in enumerate(states)}
+        ncols = len(symbols) + 1
+        dead = len(states)
+
+        table = array('i', [dead]) * ((dead + 1) * ncols)
+        for state in states:
+            row = dfa.transitions.get(state, {})
+            base = index[state] * ncols
+            for col, symbol in enumerate(symbols):
+                if symbol in row:
+                    table[base + col] = index.get(row[symbol], dead)
+
+        accepting = bytearray(dead + 1)
+        for state in states:
+            if state in dfa.accepts:
+                accepting[index[state]] = 1
+
+        object.__setattr__(self, 'symbols', symbols)
+        object.__setattr__(self, 'classes', dfa.classes)
+        # Los símbolos de un carácter se resuelven con un acceso al diccionario
+        object.__setattr__(self, 'cols', MappingProxyType({symbol: col for col, symbol in enumerate(symbols)}))
+        object.__setattr__(self, 'ncols', ncols)
+        object.__setattr__(self, 'states', states)
+        object.__setattr__(self, 'start', index.get(dfa.start, dead))
+        object.__setattr__(self, 'dead', dead)
+        object.__setattr__(self, 'table', memoryview(table).toreadonly())
+        object.__setattr__(self, 'accepting', bytes(accepting))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CompiledDFA es inmutable")
+
+    def column(self, ch: str) -> int:
+        """Columna de un carácter (la última si está fuera del alfabeto)"""
+        col = self.cols.get(ch)
+        if col is None and self.classes is not None:
+            col = self.cols.get(self.classes.classify(ch))
+        return self.ncols - 1 if col is None else col
+
+    def accepts_string(self, w: str) -> bool:
+        """Simula el DFA compilado: un cálculo de índice por carácter"""
+        table, cols, column, ncols = self.table, self.cols, self.column, self.ncols
+        current, dead = self.start, self.dead
+        for symbol in w:
+            try:
+                col = cols[symbol]
+            except KeyError:
+                col = column(symbol)
+            current = table[current * ncols + col]
+            if current == dead:
+                return False  # Ninguna continuación puede ser aceptada
+        return self.accepting[current] == 1
+
 
 def draw_dfa(dfa: DFA, filename: str = 'dfa'):
     """Visualiza el DFA usando Graphviz"""
+    from graphviz import Digraph  # Importación diferida: solo al renderizar
     dot = Digraph()
     dot.attr(rankdir='LR')
     
@@ -51,92 +181,140 @@ def draw_dfa(dfa: DFA, filename: str = 'dfa'):
     print(f"DFA renderizado: {filename}.png")
 
 
-def minimize_dfa(dfa: DFA) -> DFA:
+DEAD = -1  # Estado sumidero implícito para transiciones no definidas
+
+
+def hopcroft_partition(dfa: DFA, initial_blocks) -> list:
+    """
+    Algoritmo de Hopcroft (worklist de divisores) en O(n log n).
+    Recibe la partición inicial y devuelve la partición de equivalencia.
+    Las transiciones faltantes se tratan como ir al estado DEAD.
+    """
+    states = set(dfa.states) | {DEAD}
+    symbols = sorted(dfa.alphabet)
+
+    # Transiciones inversas: inverse[símbolo][destino] = orígenes
+    inverse = {symbol: defaultdict(list) for symbol in symbols}
+    for state in states:
+        row = dfa.transitions.get(state, {})
+        for symbol in symbols:
+            inverse[symbol][row.get(symbol, DEAD)].append(state)
+
+    # Índice estado -> bloque
+    blocks = [set(b) for b in initial_blocks if b]
+    block_of = {}
+    for i, block in enumerate(blocks):
+        for state in block:
+            block_of[state] = i
+
+    # Los bloques más pequeños de la partición inicial entran a la worklist
+    worklist = set(range(len(blocks)))
+    if len(blocks) == 2:
+        worklist = {0 if len(blocks[0]) <= len(blocks[1]) else 1}
+
+    while worklist:
+        if PROFILER.enabled:
+            PROFILER.count('refinement_rounds')
+        splitter = list(blocks[worklist.pop()])
+        for symbol in symbols:
+            # Estados que llegan al divisor con este símbolo, agrupados por bloque
+            touched = defaultdict(set)
+            for target in splitter:
+                for source in inverse[symbol].get(target, ()):
+                    touched[block_of[source]].add(source)
+
+            for i, hit in touched.items():
+                block = blocks[i]
+                if len(hit) == len(block):
+                    continue
+                # Dividir el bloque: el resto se queda en i, hit va a un bloque nuevo
+                if PROFILER.enabled:
+                    PROFILER.count('block_splits')
+                block -= hit
+                j = len(blocks)
+                blocks.append(hit)
+                for state in hit:
+                    block_of[state] = j
+                if i in worklist:
+                    worklist.add(j)
+                else:
+                    worklist.add(j if len(hit) <= len(block) else i)
+
+    return blocks
+
+
+def minimize_dfa(dfa: DFA, initial_partition: list | None = None) -> DFA:
     """
-    Algoritmo de minimización de DFA usando particionamiento
+    Algoritmo de minimización de DFA usando el algoritmo de Hopcroft.
+    initial_partition permite separar estados de aceptación distintos
+    (por ejemplo, etiquetados con patrones diferentes).
     """
+    # Paso 0: la minimización trabaja sobre el autómata sin estados inútiles
+    dfa = trim_dfa(dfa)
+
     # Paso 1: Partición inicial - estados de aceptación vs no aceptación
-    partition = [dfa.accepts, dfa.states - dfa.accepts]
-    
-    # Eliminar conjuntos vacíos
-    partition = [p for p in partition if p]
-    
-    changed = True
-    while changed:
-        changed = False
-        new_partition = []
-        
-        for group in partition:
-            # Dividir el grupo basado en transiciones
-            subgroups = defaultdict(list)
-            
-            for state in group:
-                # Crear clave basada en las transiciones de este estado
-                key = []
-                for symbol in sorted(dfa.alphabet):
-                    if state in dfa.transitions and symbol in dfa.transitions[state]:
-                        target = dfa.transitions[state][symbol]
-                        # Encontrar a qué grupo pertenece el estado destino
-                        for i, other_group in enumerate(partition):
-                            if target in other_group:
-                                key.append(i)
-                                break
-                        else:
-                            key.append(-1)  # Estado destino no encontrado
-                    else:
-                        key.append(-1)  # No hay transición para este símbolo
-                
-                key = tuple(key)
-                subgroups[key].append(state)
-            
-            # Si el grupo se dividió, agregar los subgrupos
-            if len(subgroups) > 1:
-                changed = True
-                new_partition.extend(subgroups.values())
-            else:
-                new_partition.append(group)
-        
-        partition = new_partition
-    
+    if initial_partition is None:
+        initial_partition = [dfa.accepts, set(dfa.states) - dfa.accepts]
+    initial_partition = [set(block) & dfa.states for block in initial_partition]
+    initial_partition = [block for block in initial_partition if block]
+
+    # El estado DEAD va con los estados de no aceptación (o en su propio bloque)
+    for block in initial_partition:
+        if not block & dfa.accepts:
+            block.add(DEAD)
+            break
+    else:
+        initial_partition.append({DEAD})
+    partition = hopcroft_partition(dfa, initial_partition)
+
     # Paso 2: Crear el DFA minimizado
+    # El grupo del estado DEAD no genera estados ni transiciones
+    dead_group = next(group for group in partition if DEAD in group)
+    partition = [group for group in partition if group is not dead_group]
+    if dfa.start in dead_group:
+        # Lenguaje vacío: un único estado sin transiciones
+        return DFA(start=dfa.start, accepts=set(), transitions={dfa.start: {}}, alphabet=dfa.alphabet, classes=dfa.classes)
+
     # Mapear cada estado original a su grupo representativo
     state_to_group = {}
     for group in partition:
         representative = min(group)  # Usar el estado con menor número como representante
         for state in group:
             state_to_group[state] = representative
-    
+
     # Crear nuevas transiciones
     new_transitions = {}
     new_accepts = set()
-    
+
     for group in partition:
         representative = min(group)
         new_transitions[representative] = {}
-        
+
         # Verificar si este grupo contiene estados de aceptación
         if any(state in dfa.accepts for state in group):
             new_accepts.add(representative)
-        
-        # Crear transiciones para el representante
+
+        # Crear transiciones para el representante (omitiendo las que van a DEAD)
         if representative in dfa.transitions:
             for symbol, target in dfa.transitions[representative].items():
-                new_target = state_to_group[target]
-                new_transitions[representative][symbol] = new_target
-    
+                if target in state_to_group:
+                    new_transitions[representative][symbol] = state_to_group[target]
+
     # Encontrar el nuevo estado inicial
     new_start = state_to_group[dfa.start]
-    
+
     return DFA(
         start=new_start,
         accepts=new_accepts,
         transitions=new_transitions,
-        alphabet=dfa.alphabet
+        alphabet=dfa.alphabet,
+        classes=dfa.classes
     )
 
 
 def draw_minimized_dfa(dfa: DFA, filename: str = 'dfa_minimized'):
     """Visualiza el DFA minimizado usando Graphviz"""
+    from graphviz import Digraph  # Importación diferida: solo al renderizar
     dot = Digraph()
     dot.attr(rankdir='LR')
     
@@ -160,9 +338,13 @@ def draw_minimized_dfa(dfa: DFA, filename: str = 'dfa_minimized'):
     print(f"DFA minimizado renderizado: {filename}.png")
 
 
-def compare_automata(nfa: NFA, dfa: DFA, test_strings: list) -> None:
+def compare_automata(nfa: NFA, dfa: DFA, test_strings: list, minimized: DFA | None = None) -> None:
     """Compara el comportamiento del NFA original con el DFA resultante"""
     from simulaciones import nfa_accepts
+
+    # El DFA minimizado se calcula una sola vez para todas las cadenas
+    if minimized is None:
+        minimized = minimize_dfa(dfa)
     
     print("\n--- Comparación de Autómatas ---")
     print(f"NFA estados: {len(nfa.states())}")
@@ -173,6 +355,6 @@ def compare_automata(nfa: NFA, dfa: DFA, test_strings: list) -> None:
     for test_str in test_strings:
         nfa_result = nfa_accepts(nfa, test_str)
         dfa_result = dfa.accepts_string(test_str)
-        dfa_minimized = minimize_dfa(dfa)
-        status = "✓" if nfa_result == dfa_result else "✗"
-        print(f"  '{test_str}': NFA={nfa_result}, DFA={dfa_result}, DFA Minimized={dfa_minimized.accepts_string(test_str)} {status}")
+        minimized_result = minimized.accepts_string(test_str)
+        status = "✓" if nfa_result == dfa_result == minimized_result else "✗"
+        print(f"  '{test_str}': NFA={nfa_result}, DFA={dfa_result}, DFA Minimized={minimized_result} {status}")
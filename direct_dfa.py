@@ -0,0 +1,156 @@
+from collections import deque
+from time import perf_counter
+from shunting_yard import Node
+from thompson import thompson_from_ast
+from subset import subset_construction
+from dfa import DFA, minimize_dfa
+from alphabet import SymbolClasses
+
+END = '#'  # Marcador de fin que se concatena al AST (no es un símbolo de entrada)
+
+
+def _annotate(root):
+    """
+    Calcula nullable, firstpos y lastpos de cada nodo (recorrido postorden
+    iterativo) y followpos de cada posición. Los conjuntos son máscaras de bits.
+    Devuelve (labels, followpos, firstpos de la raíz).
+    """
+    labels = []       # posición -> etiqueta de la hoja
+    followpos = []    # posición -> máscara de posiciones siguientes
+    info = {}         # id(nodo) -> (nullable, firstpos, lastpos)
+
+    stack = [(root, False)]
+    while stack:
+        node, visited = stack.pop()
+        if node.left is None and node.right is None:
+            if node.value == 'ε':
+                info[id(node)] = (True, 0, 0)
+            else:
+                bit = 1 << len(labels)
+                labels.append(node.value)
+                followpos.append(0)
+                info[id(node)] = (False, bit, bit)
+            continue
+
+        if node.value not in {'.', '|', '*', '+', '?'}:
+            raise ValueError(f"Operador no soportado en followpos: {node.value}")
+
+        if not visited:
+            stack.append((node, True))
+            if node.right is not None:
+                stack.append((node.right, False))
+            stack.append((node.left, False))
+            continue
+
+        n1, f1, l1 = info.pop(id(node.left))
+        if node.value == '.':
+            n2, f2, l2 = info.pop(id(node.right))
+            _add_follow(followpos, l1, f2)
+            info[id(node)] = (n1 and n2, f1 | f2 if n1 else f1, l1 | l2 if n2 else l2)
+        elif node.value == '|':
+            n2, f2, l2 = info.pop(id(node.right))
+            info[id(node)] = (n1 or n2, f1 | f2, l1 | l2)
+        elif node.value in {'*', '+'}:
+            _add_follow(followpos, l1, f1)
+            info[id(node)] = (node.value == '*' or n1, f1, l1)
+        else:  # '?'
+            info[id(node)] = (True, f1, l1)
+
+    _, first, _ = info[id(root)]
+    return labels, followpos, first
+
+
+def _add_follow(followpos, positions: int, targets: int):
+    while positions:
+        low = positions & -positions
+        followpos[low.bit_length() - 1] |= targets
+        positions ^= low
+
+
+def direct_dfa(ast) -> DFA:
+    """
+    Construye el DFA directamente desde el AST (firstpos/lastpos/followpos
+    de Aho-Sethi-Ullman), sin pasar por el NFA de Thompson.
+    """
+    root = Node('.', ast, Node(END)) if ast is not None else Node(END)
+    labels, followpos, first = _annotate(root)
+    end_bit = 1 << (len(labels) - 1)
+
+    classes = SymbolClasses(labels[:-1])
+    alphabet = set(classes.names)
+    # Para cada clase, máscara de posiciones cuya etiqueta la cubre
+    class_positions = {name: 0 for name in alphabet}
+    for position, label in enumerate(labels[:-1]):
+        for name in classes.label_classes[label]:
+            class_positions[name] |= 1 << position
+
+    ids = {first: 0}
+    masks = [first]
+    transitions = {}
+    accepts = set()
+    unprocessed = deque([0])
+    while unprocessed:
+        state = unprocessed.popleft()
+        mask = masks[state]
+        row = transitions[state] = {}
+        if mask & end_bit:
+            accepts.add(state)
+
+        for symbol in sorted(alphabet):
+            target = 0
+            positions = mask & class_positions[symbol]
+            while positions:
+                low = positions & -positions
+                target |= followpos[low.bit_length() - 1]
+                positions ^= low
+            if not target:
+                continue
+            if target not in ids:
+                ids[target] = len(masks)
+                masks.append(target)
+                unprocessed.append(ids[target])
+            row[symbol] = ids[target]
+
+    return DFA(start=0, accepts=accepts, transitions=transitions, alphabet=alphabet, classes=classes)
+
+
+def isomorphic(d1: DFA, d2: DFA) -> bool:
+    """Compara dos DFA (mínimos) recorriéndolos en paralelo desde el inicio"""
+    if d1.alphabet != d2.alphabet:
+        return False
+    mapping = {d1.start: d2.start}
+    queue = deque([d1.start])
+    while queue:
+        s1 = queue.popleft()
+        s2 = mapping[s1]
+        if (s1 in d1.accepts) != (s2 in d2.accepts):
+            return False
+        row1, row2 = d1.transitions.get(s1, {}), d2.transitions.get(s2, {})
+        if row1.keys() != row2.keys():
+            return False
+        for symbol, t1 in row1.items():
+            t2 = row2[symbol]
+            if t1 not in mapping:
+                mapping[t1] = t2
+                queue.append(t1)
+            elif mapping[t1] != t2:
+                return False
+    return len(set(mapping.values())) == len(mapping)
+
+
+def compare_engines(ast) -> dict:
+    """
+    Construye el DFA mínimo con ambos motores, mide el tiempo de cada uno y
+    verifica que los resultados sean isomorfos.
+    """
+    t0 = perf_counter()
+    via_thompson = minimize_dfa(subset_construction(thompson_from_ast(ast)))
+    t1 = perf_counter()
+    via_followpos = minimize_dfa(direct_dfa(ast))
+    t2 = perf_counter()
+    return {
+        'thompson': t1 - t0,
+        'followpos': t2 - t1,
+        'faster': 'thompson' if t1 - t0 <= t2 - t1 else 'followpos',
+        'equivalent': isomorphic(via_thompson, via_followpos),
+    }
@@ -0,0 +1,108 @@
+from collections import deque
+from dfa import DFA
+from alphabet import SymbolClasses
+
+DEAD = None  # Estado sumidero implícito de cada DFA
+
+
+def _step(dfa: DFA, state, ch: str):
+    if state is DEAD:
+        return DEAD
+    symbol = dfa.classes.classify(ch) if dfa.classes is not None else ch
+    return dfa.transitions.get(state, {}).get(symbol, DEAD)
+
+
+def _accepting(dfa: DFA, state) -> bool:
+    return state is not DEAD and state in dfa.accepts
+
+
+def common_symbols(d1: DFA, d2: DFA) -> list:
+    """
+    Un carácter representante por cada clase del refinamiento común de los
+    alfabetos de ambos DFA (sus símbolos pueden ser caracteres o clases '[...]').
+    """
+    classes = SymbolClasses(set(d1.alphabet) | set(d2.alphabet))
+    return sorted(classes.representatives.values())
+
+
+def _shortest_counterexample(d1: DFA, d2: DFA, symbols: list) -> str:
+    """BFS sobre el producto: la primera pareja que discrepa da la cadena más corta"""
+    start = (d1.start, d2.start)
+    parent = {start: None}
+    queue = deque([start])
+    while queue:
+        pair = queue.popleft()
+        p, q = pair
+        if _accepting(d1, p) != _accepting(d2, q):
+            word = []
+            while parent[pair] is not None:
+                pair, ch = parent[pair]
+                word.append(ch)
+            return ''.join(reversed(word))
+        for ch in symbols:
+            nxt = (_step(d1, p, ch), _step(d2, q, ch))
+            if nxt not in parent:
+                parent[nxt] = (pair, ch)
+                queue.append(nxt)
+    return None
+
+
+def equivalent(d1: DFA, d2: DFA):
+    """
+    Algoritmo de Hopcroft-Karp: une pares de estados con union-find y solo
+    explora pares no unidos, en tiempo casi lineal.
+    Devuelve (True, None) o (False, cadena distinguidora más corta).
+    """
+    symbols = common_symbols(d1, d2)
+    parent = {}
+
+    def find(x):
+        parent.setdefault(x, x)
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    def union(x, y) -> bool:
+        rx, ry = find(x), find(y)
+        if rx == ry:
+            return False
+        parent[rx] = ry
+        return True
+
+    union((1, d1.start), (2, d2.start))
+    queue = deque([(d1.start, d2.start)])
+    while queue:
+        p, q = queue.popleft()
+        if _accepting(d1, p) != _accepting(d2, q):
+            return False, _shortest_counterexample(d1, d2, symbols)
+        for ch in symbols:
+            p2, q2 = _step(d1, p, ch), _step(d2, q, ch)
+            if union((1, p2), (2, q2)):
+                queue.append((p2, q2))
+    return True, None
+
+
+def verify_pipeline(regexes) -> list:
+    """
+    Verifica, para cada expresión, que subset_construction coincide con el DFA
+    construido directamente por followpos y que minimize_dfa preserva el lenguaje.
+    """
+    from pattern_cache import compile as compile_regex
+    from direct_dfa import direct_dfa
+
+    results = []
+    for regex in regexes:
+        pattern = compile_regex(regex)
+        subset_ok, subset_witness = equivalent(pattern.dfa, direct_dfa(pattern.ast))
+        minimized_ok, minimized_witness = equivalent(pattern.dfa, pattern.minimized)
+        results.append({
+            'regex': regex,
+            'subset': subset_ok,
+            'subset_counterexample': subset_witness,
+            'minimized': minimized_ok,
+            'minimized_counterexample': minimized_witness,
+        })
+    return results
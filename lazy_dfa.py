@@ -0,0 +1,90 @@
+from thompson import NFA
+
+DEAD = -1  # Transición memoizada hacia el conjunto vacío
+
+
+class LazyDFA:
+    """
+    DFA construido bajo demanda (construcción de subconjuntos perezosa).
+    Cada estado del DFA es una máscara de estados del NFA compilado y sus
+    transiciones, por clase del alfabeto, se memoizan a medida que la entrada
+    las alcanza.
+    Si el caché supera max_states se vacía; si se vacía más de max_flushes
+    veces en una misma cadena, el resto se simula directamente sobre el NFA.
+    """
+
+    def __init__(self, nfa: NFA, max_states: int = 4096, max_flushes: int = 8):
+        self.nfa = nfa.compiled()
+        self.max_states = max_states
+        self.max_flushes = max_flushes
+        self.hits = 0
+        self.misses = 0
+        self.flushes = 0
+        self.fallbacks = 0
+        self.flush()
+        self.flushes = 0
+
+    def flush(self):
+        """Vacía el caché de estados y transiciones"""
+        self._ids = {}      # máscara -> id de estado
+        self._masks = []    # id de estado -> máscara
+        self._next = []     # id de estado -> {clase: id de estado}
+        self.flushes += 1
+
+    def _intern(self, mask: int) -> int:
+        state = self._ids.get(mask)
+        if state is None:
+            if len(self._masks) >= self.max_states:
+                self.flush()
+            state = len(self._masks)
+            self._ids[mask] = state
+            self._masks.append(mask)
+            self._next.append({})
+        return state
+
+    def accepts_string(self, w: str) -> bool:
+        nfa = self.nfa
+        flushes_at_start = self.flushes
+        current = self._intern(nfa.start_mask)
+        classify = nfa.classes.classify
+
+        for i, ch in enumerate(w):
+            symbol = classify(ch)
+            nxt = self._next[current].get(symbol)
+            if nxt is not None:
+                self.hits += 1
+                if nxt == DEAD:
+                    return False
+                current = nxt
+                continue
+
+            self.misses += 1
+            mask = nfa.step_class(self._masks[current], symbol)
+            if not mask:
+                self._next[current][symbol] = DEAD
+                return False
+
+            generation = self.flushes
+            nxt = self._intern(mask)
+            if self.flushes == generation:
+                self._next[current][symbol] = nxt
+            elif self.flushes - flushes_at_start > self.max_flushes:
+                # El caché no se estabiliza: continuar con el NFA directamente
+                self.fallbacks += 1
+                for ch in w[i + 1:]:
+                    mask = nfa.step(mask, ch)
+                    if not mask:
+                        return False
+                return bool(mask & nfa.accept_mask)
+            current = nxt
+
+        return bool(self._masks[current] & nfa.accept_mask)
+
+    def stats(self) -> dict:
+        return {
+            'states': len(self._masks),
+            'hits': self.hits,
+            'misses': self.misses,
+            'flushes': self.flushes,
+            'fallbacks': self.fallbacks,
+        }
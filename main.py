@@ -1,11 +1,14 @@
 import os
-from shunting_yard import build_ast_from_infix, draw_ast
-from thompson import thompson_from_ast, draw_nfa
+import sys
+from itertools import repeat
 from simulaciones import nfa_accepts
-from dfa import minimize_dfa, draw_dfa, draw_minimized_dfa, compare_automata
-from subset import subset_construction, get_alphabet
+from dfa import compare_automata
+from equivalence import equivalent
+from analysis import validation_strings, count_accepted
+from pattern_cache import compile as compile_regex
+from profiling import PROFILER
 
-def process_files(path_regex: str, path_words: str|None=None, single_w: str|None=None, render_ast: bool=False, build_dfa: bool=True, minimize_dfa_flag: bool=True):
+def process_files(path_regex: str, path_words: str|None=None, single_w: str|None=None, render_ast: bool=False, build_dfa: bool=True, minimize_dfa_flag: bool=True, parallel: bool=False, workers: int|None=None, renderer=None, engine: str='thompson', profile: bool=False, profile_path: str|None=None):
     if not os.path.exists(path_regex):
         print(f"Error: no existe el archivo {path_regex}")
         return
@@ -13,51 +16,104 @@ def process_files(path_regex: str, path_words: str|None=None, single_w: str|None
         regexes = [line.strip() for line in f if line.strip()]
     palabras = None
     if single_w is not None:
-        palabras = [single_w]*len(regexes)
+        palabras = repeat(single_w)
     elif path_words is not None and os.path.exists(path_words):
-        with open(path_words, 'r', encoding='utf-8') as fw:
-            palabras = [line.strip() for line in fw]
-        m = min(len(regexes), len(palabras))
-        regexes, palabras = regexes[:m], palabras[:m]
+        from batch import iter_lines
+        # Las palabras se leen de forma perezosa; zip corta en la lista más corta
+        palabras = iter_lines(path_words)
+    process_regexes(regexes, palabras, render_ast, build_dfa, minimize_dfa_flag, parallel, workers, renderer, engine, profile, profile_path)
+
+
+def process_regexes(regexes, palabras=None, render_ast: bool=False, build_dfa: bool=True, minimize_dfa_flag: bool=True, parallel: bool=False, workers: int|None=None, renderer=None, engine: str='thompson', profile: bool=False, profile_path: str|None=None):
+    """Procesa expresiones ya en memoria; palabras es un iterable paralelo a regexes (o None)"""
+    # Modo --profile: se mide esta ejecución y se reporta al final en JSON
+    if profile:
+        PROFILER.reset()
+        PROFILER.enable()
+        try:
+            _process(regexes, palabras, render_ast, build_dfa, minimize_dfa_flag, parallel, workers, renderer, engine)
+            if renderer is not None:
+                renderer.flush()  # Incluir los renders pendientes en la medición
+        finally:
+            PROFILER.disable()
+        print("\n--- Perfil ---")
+        print(PROFILER.to_json())
+        if profile_path is not None:
+            PROFILER.export(profile_path)
+        return
+    _process(regexes, palabras, render_ast, build_dfa, minimize_dfa_flag, parallel, workers, renderer, engine)
+
+
+def _process(regexes, palabras, render_ast, build_dfa, minimize_dfa_flag, parallel, workers, renderer, engine):
+    if parallel:
+        from batch import batch_process
+        for i, res in enumerate(batch_process(regexes, palabras, workers, engine=engine), 1):
+            print(f"\n--- Expresión {i} ---")
+            print(f"Postfix  : {res['postfix']}")
+            nfa_info = f"NFA: {res['nfa_states']} estados, " if res['nfa_states'] is not None else ''
+            print(f"{nfa_info}DFA: {res['dfa_states']} estados, DFA minimizado: {res['minimized_states']} estados")
+            if res['word'] is not None:
+                print(f"w='{res['word']}' -> {'sí' if res['accepted'] else 'no'}")
+        return
     
-    for i,r in enumerate(regexes,1):
+    for i,(r,w) in enumerate(zip(regexes, palabras if palabras is not None else repeat(None)),1):
         print(f"\n--- Expresión {i} ---")
-        expanded, postfix, ast = build_ast_from_infix(r)
-        print(f"Expandida: {expanded}")
-        print(f"Postfix  : {postfix}")
-        if render_ast: draw_ast(ast, f'ast_expr_{i}')
+        # El pipeline completo se reutiliza si la expresión ya fue compilada
+        pattern = compile_regex(r, engine)
+        ast = pattern.ast
+        print(f"Formateada: {pattern.normalized}")
+        print(f"Postfix  : {pattern.postfix}")
+        # El renderizado es opcional y se delega al backend
+        render = renderer.render if renderer is not None else lambda *args: None
+        if render_ast: render('ast', ast, f'ast_expr_{i}')
         
-        # Construir NFA
-        nfa = thompson_from_ast(ast)
-        draw_nfa(nfa, f'nfa_expr_{i}')
+        # Construir NFA (con followpos solo se construye si hay que renderizarlo)
+        if renderer is not None:
+            render('nfa', pattern.nfa, f'nfa_expr_{i}')
         
         # Construir DFA usando construcción de subconjuntos
         if build_dfa:
-            print(f"\n--- Construcción de DFA (Subconjuntos) ---")
-            dfa = subset_construction(nfa)
-            draw_dfa(dfa, f'dfa_expr_{i}')
+            print(f"\n--- Construcción de DFA ({'Subconjuntos' if engine == 'thompson' else 'followpos'}) ---")
+            dfa = pattern.dfa
+            render('dfa', dfa, f'dfa_expr_{i}')
             print(f"DFA construido con {len(dfa.states)} estados")
             
             # Minimizar DFA
             if minimize_dfa_flag:
                 print(f"\n--- Minimización de DFA ---")
-                minimized_dfa = minimize_dfa(dfa)
-                draw_minimized_dfa(minimized_dfa, f'dfa_minimized_expr_{i}')
+                minimized_dfa = pattern.minimized
+                render('dfa', minimized_dfa, f'dfa_minimized_expr_{i}')
                 print(f"DFA minimizado con {len(minimized_dfa.states)} estados")
                 
-                # Comparar autómatas
-                test_strings = palabras[i-1:i] if palabras else ['a', 'b', 'ab', 'ba', 'aa', 'bb', 'aba', 'bab', '01', '10', '010', '101', '0', '1', '00']
-                compare_automata(nfa, dfa, test_strings)
+                # Comparar autómatas (con followpos, el NFA de Thompson sirve de referencia)
+                # Sin cadena dada se prueban las aceptadas y rechazadas más cortas del lenguaje
+                test_strings = [w] if w is not None else validation_strings(minimized_dfa)
+                compare_automata(pattern.nfa, dfa, test_strings, minimized_dfa)
+
+                # Verificación exacta: el DFA minimizado reconoce el mismo lenguaje
+                ok, witness = equivalent(dfa, minimized_dfa)
+                print(f"Equivalencia DFA / DFA minimizado: {'✓' if ok else f'✗ (contraejemplo: {witness!r})'}")
+                print(f"Palabras aceptadas por longitud (0-5): {[count_accepted(minimized_dfa, n) for n in range(6)]}")
 
-        if palabras:
-            w = palabras[i-1]
-            ok = nfa_accepts(nfa, w)
+        if w is not None:
+            ok = nfa_accepts(pattern.nfa, w)
             print(f"w='{w}' -> {'sí' if ok else 'no'}")
 
 
-def main():
+def main(argv=None):
+    from render import RenderBackend
+
     ruta_expresiones = "expresiones.txt"
 
+    # --profile [ruta.json]: reporta el tiempo por etapa y los contadores del pipeline
+    argv = sys.argv[1:] if argv is None else argv
+    profile = '--profile' in argv
+    profile_path = None
+    if profile:
+        k = argv.index('--profile')
+        if k + 1 < len(argv) and not argv[k + 1].startswith('--'):
+            profile_path = argv[k + 1]
+
     while True:
         print("\n===== MENÚ PRINCIPAL =====")
         print("1. Ingresar una cadena y procesar")
@@ -68,18 +124,14 @@ def main():
 
         if opcion == "1":
             cadena = input("Ingrese la cadena a probar: ").strip()
-            process_files(ruta_expresiones, single_w=cadena, render_ast=True)
+            with RenderBackend('png') as renderer:
+                process_files(ruta_expresiones, single_w=cadena, render_ast=True, renderer=renderer, profile=profile, profile_path=profile_path)
 
         elif opcion == "2":
             expresion = input("Ingrese la expresión regular a procesar: ").strip()
             cadena = input("Ingrese la cadena a probar: ").strip()
-            # Guardar la expresión en un archivo temporal
-            ruta_temp = "expresion_temp.txt"
-            if os.path.exists(ruta_temp):
-                os.remove(ruta_temp)
-            with open(ruta_temp, 'w', encoding='utf-8') as f:
-                f.write(expresion + '\n')
-            process_files(ruta_temp, single_w=cadena, render_ast=True)
+            with RenderBackend('png') as renderer:
+                process_regexes([expresion], [cadena], render_ast=True, renderer=renderer, profile=profile, profile_path=profile_path)
 
         elif opcion == "3":
             print("Saliendo...")
@@ -89,5 +141,5 @@ def main():
             print("Opción no válida, intente de nuevo.")
 
 
-
-main()
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+from thompson import NFA
+from simulaciones import CompiledNFA
+from dfa import DFA, CompiledDFA
+
+
+class _DFAProgram:
+    """Parte compartida (inmutable) de un Matcher sobre un DFA compilado"""
+    __slots__ = ('compiled', 'byte_cols', 'initial')
+
+    def __init__(self, compiled: CompiledDFA):
+        self.compiled = compiled
+        # Los bytes se interpretan como caracteres latin-1
+        self.byte_cols = [compiled.column(chr(b)) for b in range(256)]
+        self.initial = compiled.start
+
+    def feed(self, state: int, chunk) -> int:
+        compiled = self.compiled
+        table, ncols, dead = compiled.table, compiled.ncols, compiled.dead
+        if isinstance(chunk, str):
+            cols, column = compiled.cols, compiled.column
+            columns = (cols[ch] if ch in cols else column(ch) for ch in chunk)
+        else:
+            byte_cols = self.byte_cols
+            columns = (byte_cols[b] for b in memoryview(chunk).cast('B'))
+        for col in columns:
+            state = table[state * ncols + col]
+            if state == dead:
+                break
+        return state
+
+    def is_accepting(self, state: int) -> bool:
+        return self.compiled.accepting[state] == 1
+
+    def is_dead(self, state: int) -> bool:
+        return state == self.compiled.dead
+
+
+class _NFAProgram:
+    """Parte compartida (inmutable) de un Matcher sobre un NFA compilado (máscaras de bits)"""
+    __slots__ = ('compiled', 'initial')
+
+    def __init__(self, compiled: CompiledNFA):
+        self.compiled = compiled
+        self.initial = compiled.start_mask
+
+    def feed(self, state: int, chunk) -> int:
+        step = self.compiled.step
+        symbols = chunk if isinstance(chunk, str) else map(chr, memoryview(chunk).cast('B'))
+        for ch in symbols:
+            state = step(state, ch)
+            if not state:
+                break
+        return state
+
+    def is_accepting(self, state: int) -> bool:
+        return bool(state & self.compiled.accept_mask)
+
+    def is_dead(self, state: int) -> bool:
+        return state == 0
+
+
+class Matcher:
+    """
+    Reconocedor incremental: recibe la entrada por fragmentos con feed().
+    El autómata compilado se comparte entre copias; el estado propio es un
+    único entero (estado del DFA o máscara del NFA), por lo que copy() es
+    barato y un mismo autómata puede atender miles de flujos.
+    Acepta str, bytes, bytearray y memoryview (los bytes se leen sin copiar).
+    """
+    __slots__ = ('_program', 'state')
+
+    def __init__(self, automaton):
+        if isinstance(automaton, (_DFAProgram, _NFAProgram)):
+            self._program = automaton
+        elif isinstance(automaton, DFA):
+            self._program = _DFAProgram(automaton.compile())
+        elif isinstance(automaton, CompiledDFA):
+            self._program = _DFAProgram(automaton)
+        elif isinstance(automaton, NFA):
+            self._program = _NFAProgram(automaton.compiled())
+        elif isinstance(automaton, CompiledNFA):
+            self._program = _NFAProgram(automaton)
+        else:
+            raise TypeError(f"No se puede construir un Matcher desde {type(automaton).__name__}")
+        self.state = self._program.initial
+
+    def feed(self, chunk) -> 'Matcher':
+        if not self._program.is_dead(self.state):
+            self.state = self._program.feed(self.state, chunk)
+        return self
+
+    def is_accepting(self) -> bool:
+        return self._program.is_accepting(self.state)
+
+    def is_dead(self) -> bool:
+        """True si ninguna continuación de la entrada puede ser aceptada"""
+        return self._program.is_dead(self.state)
+
+    def reset(self) -> 'Matcher':
+        self.state = self._program.initial
+        return self
+
+    def copy(self) -> 'Matcher':
+        clone = Matcher(self._program)
+        clone.state = self.state
+        return clone
+
+    __copy__ = copy
@@ -0,0 +1,95 @@
+from shunting_yard import build_ast_from_infix
+from thompson import NFA, thompson_from_ast, new_state, add_transition
+from subset import StateLimitError, determinize
+from dfa import DFA, minimize_dfa
+
+
+class MultiDFA:
+    """
+    DFA que reconoce varios patrones a la vez.
+    Cada estado de aceptación está etiquetado con los índices de los
+    patrones que aceptan, de modo que una sola pasada indica cuáles coinciden.
+    """
+
+    def __init__(self, patterns: list, dfa: DFA, tags: dict):
+        self.patterns = patterns
+        self.dfa = dfa
+        self.tags = tags  # estado -> frozenset de índices de patrones
+        self._compiled = dfa.compile()
+        self._dense_tags = [tags.get(state, frozenset()) for state in self._compiled.states] + [frozenset()]
+
+    def match(self, w: str) -> frozenset:
+        """Índices de los patrones que aceptan la cadena completa"""
+        compiled = self._compiled
+        table, cols, column, ncols = compiled.table, compiled.cols, compiled.column, compiled.ncols
+        current, dead = compiled.start, compiled.dead
+        for symbol in w:
+            try:
+                col = cols[symbol]
+            except KeyError:
+                col = column(symbol)
+            current = table[current * ncols + col]
+            if current == dead:
+                break  # Ningún patrón puede aceptar ya
+        return self._dense_tags[current]
+
+    def classify(self, words):
+        """Genera (palabra, índices de patrones) para cada palabra"""
+        for w in words:
+            yield w, self.match(w)
+
+
+def union_nfa(regexes: list):
+    """
+    Une los NFA de Thompson de todas las expresiones bajo un nuevo estado inicial.
+    Devuelve el NFA y un diccionario estado de aceptación -> índice de patrón.
+    """
+    counter = [0]
+    transitions = {}
+    accept_tags = {}
+    starts = []
+    for i, regex in enumerate(regexes):
+        _, _, ast = build_ast_from_infix(regex)
+        nfa = thompson_from_ast(ast, counter)
+        transitions.update(nfa.transitions)
+        starts.append(nfa.start)
+        for a in nfa.accepts:
+            accept_tags[a] = i
+
+    start = new_state(counter)
+    for s in starts:
+        add_transition(transitions, start, 'ε', s)
+    return NFA(start, set(accept_tags), transitions), accept_tags
+
+
+def compile_patterns(regexes: list, minimize: bool = True, max_states: int | None = None) -> MultiDFA:
+    """
+    Construcción de subconjuntos sobre la unión de NFA, etiquetando cada estado
+    del DFA con los patrones que acepta, y minimización sin mezclar etiquetas.
+    Si el DFA supera max_states se lanza StateLimitError.
+    """
+    nfa, accept_tags = union_nfa(regexes)
+    compiled = nfa.compiled()
+    tag_masks = [(1 << compiled.index[a], i) for a, i in accept_tags.items()]
+    classes = compiled.classes
+    alphabet = set(classes.names)
+    masks, transitions, limited = determinize(compiled, max_states)
+
+    tags = {}
+    for state, mask in enumerate(masks):
+        labels = frozenset(i for bit, i in tag_masks if mask & bit)
+        if labels:
+            tags[state] = labels
+    dfa = DFA(start=0, accepts=set(tags), transitions=transitions, alphabet=alphabet, classes=classes)
+    if limited:
+        raise StateLimitError(max_states, dfa)
+
+    if minimize:
+        # Partición inicial: un bloque por cada conjunto de etiquetas
+        blocks = {}
+        for state in dfa.states:
+            blocks.setdefault(tags.get(state, frozenset()), set()).add(state)
+        dfa = minimize_dfa(dfa, list(blocks.values()))
+        tags = {state: labels for state, labels in tags.items() if state in dfa.states}
+
+    return MultiDFA(list(regexes), dfa, tags)
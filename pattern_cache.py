@@ -0,0 +1,135 @@
+from collections import OrderedDict
+from shunting_yard import format_regex, infix_to_postfix, postfix_to_ast
+from thompson import thompson_from_ast
+from subset import subset_construction
+from dfa import minimize_dfa
+from direct_dfa import direct_dfa
+from search import search
+from profiling import PROFILER, stage
+
+ENGINES = {'thompson', 'followpos'}
+
+
+class CompiledPattern:
+    """
+    Resultado del pipeline regex -> AST -> NFA -> DFA -> DFA minimizado.
+    Cada etapa posterior al AST se construye la primera vez que se pide, así
+    que quien solo usa el NFA no paga la construcción de subconjuntos ni la
+    minimización. Con el motor 'followpos' el DFA sale directo del AST y el
+    NFA se construye solo si se pide.
+    """
+    __slots__ = ('regex', 'normalized', 'postfix', 'ast', 'engine', '_nfa', '_dfa', '_minimized', '_compiled')
+
+    def __init__(self, regex, normalized, postfix, ast, engine='thompson'):
+        self.regex = regex
+        self.normalized = normalized
+        self.postfix = postfix
+        self.ast = ast
+        self.engine = engine
+        self._nfa = None
+        self._dfa = None
+        self._minimized = None
+        self._compiled = None
+
+    @property
+    def nfa(self):
+        if self._nfa is None:
+            with stage('thompson'):
+                self._nfa = thompson_from_ast(self.ast)
+            if PROFILER.enabled:
+                PROFILER.count('nfa_states', len(self._nfa.states()))
+                PROFILER.count('nfa_edges', sum(len(lst) for lst in self._nfa.transitions.values()))
+        return self._nfa
+
+    @property
+    def dfa(self):
+        if self._dfa is None:
+            if self.engine == 'thompson':
+                nfa = self.nfa
+                with stage('subset_construction'):
+                    self._dfa = subset_construction(nfa)
+            else:
+                with stage('direct_dfa'):
+                    self._dfa = direct_dfa(self.ast)
+            PROFILER.count('dfa_states', len(self._dfa.states))
+        return self._dfa
+
+    @property
+    def minimized(self):
+        if self._minimized is None:
+            dfa = self.dfa
+            with stage('minimize_dfa'):
+                self._minimized = minimize_dfa(dfa)
+            PROFILER.count('dfa_states_minimized', len(self._minimized.states))
+        return self._minimized
+
+    @property
+    def compiled(self):
+        if self._compiled is None:
+            self._compiled = self.minimized.compile()
+        return self._compiled
+
+    def accepts_string(self, w: str) -> bool:
+        return self.compiled.accepts_string(w)
+
+    def search(self, text) -> list:
+        """Coincidencias (inicio, fin) más a la izquierda y más largas dentro de text"""
+        return list(search(self.compiled, text))
+
+
+class PatternCache:
+    """
+    Caché LRU de patrones compilados.
+    La clave es la expresión normalizada (salida de format_regex) y el motor:
+    'thompson' (NFA + subconjuntos) o 'followpos' (DFA directo desde el AST).
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def compile(self, regex: str, engine: str = 'thompson') -> CompiledPattern:
+        if engine not in ENGINES:
+            raise ValueError(f"Motor no soportado: {engine}")
+        with stage('format_regex'):
+            key = (format_regex(regex), engine)
+        pattern = self._entries.get(key)
+        if pattern is not None:
+            self.hits += 1
+            PROFILER.count('cache_hits')
+            self._entries.move_to_end(key)
+            return pattern
+
+        self.misses += 1
+        PROFILER.count('cache_misses')
+        with stage('infix_to_postfix'):
+            postfix = infix_to_postfix(regex)
+        with stage('postfix_to_ast'):
+            ast = postfix_to_ast(postfix)
+        pattern = CompiledPattern(regex, key[0], postfix, ast, engine)
+
+        self._entries[key] = pattern
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return pattern
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def info(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries), 'maxsize': self.maxsize}
+
+
+default_cache = PatternCache()
+
+
+def compile(regex: str, engine: str = 'thompson') -> CompiledPattern:
+    """Compila una expresión regular usando el caché por defecto"""
+    return default_cache.compile(regex, engine)
@@ -0,0 +1,133 @@
+"""
+Máquina virtual de Pike sobre el NFA de Thompson: extracción de subgrupos en
+tiempo O(n·m), sin retroceso.
+
+Cada hilo es un estado del NFA más sus ranuras de captura. En cada posición se
+mantiene a lo sumo un hilo por estado (el de mayor prioridad), y la prioridad
+la da el orden de las aristas ε: en '|' la rama izquierda, en '*', '+' y '?'
+repetir antes que salir (cuantificadores codiciosos).
+
+    vm = PikeVM.from_regex('(a|b)*(c)')
+    vm.search('xxabcyy')   # [(2, 5), (3, 4), (4, 5)]
+
+Las ranuras 0 y 1 son la coincidencia completa; el grupo k usa 2k y 2k+1.
+A diferencia del módulo re, un bucle cuyo cuerpo acepta la cadena vacía no
+agrega una iteración vacía final, así que sus grupos pueden diferir.
+"""
+from shunting_yard import build_ast_from_infix, label_matches
+from thompson import NFA, thompson_from_ast
+
+MODES = {'first', 'longest'}
+
+
+class PikeVM:
+    """
+    mode='first': la coincidencia de mayor prioridad entre las que empiezan
+    más a la izquierda (semántica de Perl/RE2).
+    mode='longest': la más larga entre las que empiezan más a la izquierda;
+    los subgrupos siguen la prioridad de las aristas.
+    """
+    __slots__ = ('nfa', 'ngroups', 'mode', 'epsilons', 'edges')
+
+    def __init__(self, nfa: NFA, mode: str = 'first'):
+        if mode not in MODES:
+            raise ValueError(f"Modo no soportado: {mode}")
+        self.nfa = nfa
+        self.ngroups = max(nfa.tags.values(), default=1) // 2
+        self.mode = mode
+        # Aristas separadas por tipo, en el orden de prioridad de construcción
+        self.epsilons = {}
+        self.edges = {}
+        for u, lst in nfa.transitions.items():
+            self.epsilons[u] = [v for sym, v in lst if sym == 'ε']
+            self.edges[u] = [(sym, v) for sym, v in lst if sym != 'ε']
+
+    @classmethod
+    def from_regex(cls, regex: str, mode: str = 'first') -> 'PikeVM':
+        _, _, ast = build_ast_from_infix(regex, captures=True)
+        return cls(thompson_from_ast(ast), mode)
+
+    def _add(self, threads: list, seen: set, state, slots: tuple, pos: int):
+        """Agrega el hilo y su cierre ε en orden de prioridad (DFS en preorden)"""
+        tags, epsilons, edges, accepts = self.nfa.tags, self.epsilons, self.edges, self.nfa.accepts
+        stack = [(state, slots)]
+        while stack:
+            state, slots = stack.pop()
+            if state in seen:
+                continue
+            seen.add(state)
+            tag = tags.get(state)
+            if tag is not None:
+                slots = slots[:tag] + (pos,) + slots[tag + 1:]
+            if edges.get(state) or state in accepts:
+                threads.append((state, slots))
+            for target in reversed(epsilons.get(state, ())):
+                if target not in seen:
+                    stack.append((target, slots))
+
+    def _run(self, text: str, pos: int, anchored: bool, full: bool):
+        """Ranuras de la mejor coincidencia que empieza en pos (o después si no está anclada)"""
+        accepts, edges = self.nfa.accepts, self.edges
+        longest = self.mode == 'longest'
+        empty = (None,) * (2 * self.ngroups + 1)
+        n = len(text)
+        best = None
+        threads, seen = [], set()
+        seeding = True
+        while True:
+            # Hilo nuevo al final de la lista: menor prioridad que los ya activos
+            if seeding and best is None:
+                self._add(threads, seen, self.nfa.start, (pos,) + empty, pos)
+            seeding = not anchored
+
+            ch = text[pos] if pos < n else None
+            following, seen = [], set()
+            for state, slots in threads:
+                if longest and best is not None and slots[0] > best[0]:
+                    continue  # Empieza más a la derecha que la coincidencia encontrada
+                if state in accepts and (not full or ch is None):
+                    if best is None or not longest or slots[0] < best[0] or pos > best[1]:
+                        best = (slots[0], pos) + slots[2:]
+                    if not longest:
+                        break  # Los hilos restantes tienen menor prioridad
+                    continue
+                if ch is None:
+                    continue
+                for label, target in edges.get(state, ()):
+                    if target not in seen and label_matches(label, ch):
+                        self._add(following, seen, target, slots, pos + 1)
+            if ch is None or (not following and (best is not None or anchored)):
+                return best
+            threads = following
+            pos += 1
+
+    def _spans(self, slots) -> list:
+        if slots is None:
+            return None
+        return [
+            (slots[2 * k], slots[2 * k + 1]) if slots[2 * k] is not None and slots[2 * k + 1] is not None else None
+            for k in range(self.ngroups + 1)
+        ]
+
+    def fullmatch(self, text: str) -> list | None:
+        """Spans de todos los grupos si text completo pertenece al lenguaje"""
+        return self._spans(self._run(text, 0, anchored=True, full=True))
+
+    def match(self, text: str, pos: int = 0) -> list | None:
+        """Coincidencia anclada en pos (no necesita llegar al final)"""
+        return self._spans(self._run(text, pos, anchored=True, full=False))
+
+    def search(self, text: str, pos: int = 0) -> list | None:
+        """Primera coincidencia no anclada a partir de pos"""
+        return self._spans(self._run(text, pos, anchored=False, full=False))
+
+    def finditer(self, text: str):
+        """Coincidencias sucesivas sin solaparse; tras una vacía se avanza un carácter"""
+        pos = 0
+        while pos <= len(text):
+            spans = self.search(text, pos)
+            if spans is None:
+                return
+            yield spans
+            start, end = spans[0]
+            pos = end if end > start else end + 1
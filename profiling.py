@@ -0,0 +1,72 @@
+"""
+Instrumentación del pipeline: tiempo por etapa y contadores.
+
+Desactivada por defecto. Con PROFILER.enabled en False, stage() devuelve un
+contexto vacío compartido y los contadores de los bucles internos se protegen
+con `if PROFILER.enabled`, así que el costo es una comprobación de atributo.
+"""
+import json
+from contextlib import nullcontext
+from time import perf_counter
+
+_NO_OP = nullcontext()
+
+
+class _Stage:
+    __slots__ = ('profiler', 'name', 'started')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.started = perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        total = self.profiler.timings.setdefault(self.name, [0.0, 0])
+        total[0] += perf_counter() - self.started
+        total[1] += 1
+
+
+class Profiler:
+    def __init__(self):
+        self.enabled = False
+        self.timings = {}    # etapa -> [segundos acumulados, llamadas]
+        self.counters = {}   # nombre -> valor
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        self.timings = {}
+        self.counters = {}
+
+    def stage(self, name: str):
+        """Contexto que mide el tiempo de una etapa (no hace nada si está desactivado)"""
+        return _Stage(self, name) if self.enabled else _NO_OP
+
+    def count(self, name: str, n: int = 1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def report(self) -> dict:
+        return {
+            'stages': {name: {'seconds': total, 'calls': calls} for name, (total, calls) in self.timings.items()},
+            'counters': dict(self.counters),
+        }
+
+    def to_json(self, indent: int | None = 2) -> str:
+        return json.dumps(self.report(), indent=indent, ensure_ascii=False)
+
+    def export(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.to_json())
+
+
+PROFILER = Profiler()
+stage = PROFILER.stage
+count = PROFILER.count
@@ -0,0 +1,171 @@
+"""
+Backend de renderizado opcional para AST, NFA y DFA.
+
+Genera texto DOT directamente (sin graphviz). Según el modo:
+  'off' -> no hace nada
+  'dot' -> acumula los .dot y los escribe por lotes
+  'png' -> renderiza con graphviz en un pool de hilos acotado
+graphviz solo se importa cuando se renderiza un PNG.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from profiling import stage
+
+
+def _quote(text) -> str:
+    return '"' + str(text).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def ast_to_dot(root) -> str:
+    lines = ['digraph {']
+    stack = [(root, None)] if root else []
+    counter = 0
+    while stack:
+        node, parent = stack.pop()
+        node_id = str(counter)
+        counter += 1
+        lines.append(f'\t{node_id} [label={_quote(node.value)}]')
+        if parent is not None:
+            lines.append(f'\t{parent} -> {node_id}')
+        # Se apila el derecho primero para numerar en preorden (igual que draw_ast)
+        if node.right:
+            stack.append((node.right, node_id))
+        if node.left:
+            stack.append((node.left, node_id))
+    lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+
+def _automaton_dot(states, accepts, start, edges) -> str:
+    lines = ['digraph {', '\trankdir=LR', '\tstart [label="" shape=point]']
+    for q in states:
+        shape = 'doublecircle' if q in accepts else 'circle'
+        lines.append(f'\t{q} [label=q{q} shape={shape}]')
+    lines.append(f'\tstart -> {start}')
+    for u, sym, v in edges:
+        lines.append(f'\t{u} -> {v} [label={_quote(sym)}]')
+    lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+
+def nfa_to_dot(nfa) -> str:
+    edges = ((u, sym, v) for u, lst in nfa.transitions.items() for sym, v in lst)
+    return _automaton_dot(sorted(nfa.states()), nfa.accepts, nfa.start, edges)
+
+
+def dfa_to_dot(dfa) -> str:
+    edges = ((u, sym, v) for u, row in dfa.transitions.items() for sym, v in row.items())
+    return _automaton_dot(sorted(dfa.states), dfa.accepts, dfa.start, edges)
+
+
+def _summary_dot(kind: str, n_states: int) -> str:
+    return f'digraph {{\n\tsummary [label={_quote(f"{kind}: {n_states} estados (omitido)")} shape=box]\n}}\n'
+
+
+def _count_states(kind: str, obj) -> int:
+    if kind == 'ast':
+        count, stack = 0, [obj] if obj else []
+        while stack:
+            node = stack.pop()
+            count += 1
+            stack.extend(n for n in (node.left, node.right) if n)
+        return count
+    if kind == 'nfa':
+        return len(obj.states())
+    return len(obj.states)
+
+
+class RenderBackend:
+    """
+    Backend de renderizado configurable.
+    max_states: autómatas más grandes se omiten ('skip') o se resumen ('summary').
+    workers: hilos para los renders PNG; max_pending limita la cola.
+    """
+    _TO_DOT = {'ast': ast_to_dot, 'nfa': nfa_to_dot, 'dfa': dfa_to_dot}
+
+    def __init__(self, mode: str = 'png', max_states: int | None = 200, oversize: str = 'summary',
+                 workers: int = 2, max_pending: int = 16, output_dir: str = '.', batch_size: int = 64):
+        if mode not in {'off', 'dot', 'png'}:
+            raise ValueError(f"Modo de renderizado no soportado: {mode}")
+        if oversize not in {'skip', 'summary'}:
+            raise ValueError(f"Política de tamaño no soportada: {oversize}")
+        self.mode = mode
+        self.max_states = max_states
+        self.oversize = oversize
+        self.output_dir = output_dir
+        self.batch_size = batch_size
+        self.workers = workers
+        self._pending_dot = []
+        self._executor = None
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._futures = []
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != 'off'
+
+    def render(self, kind: str, obj, filename: str):
+        """Encola el renderizado de un AST ('ast'), NFA ('nfa') o DFA ('dfa')"""
+        if not self.enabled:
+            return
+        with stage('render'):
+            n_states = _count_states(kind, obj)
+            if self.max_states is not None and n_states > self.max_states:
+                if self.oversize == 'skip':
+                    print(f"Renderizado omitido: {filename} ({n_states} estados)")
+                    return
+                text = _summary_dot(kind.upper(), n_states)
+            else:
+                text = self._TO_DOT[kind](obj)
+
+            path = os.path.join(self.output_dir, filename)
+            if self.mode == 'dot':
+                self._pending_dot.append((path, text))
+                if len(self._pending_dot) >= self.batch_size:
+                    self._write_dot_batch()
+            else:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers)
+                self._slots.acquire()
+                future = self._executor.submit(self._render_png, path, text)
+                future.add_done_callback(lambda _: self._slots.release())
+                self._futures.append(future)
+
+    def _write_dot_batch(self):
+        for path, text in self._pending_dot:
+            with open(f'{path}.dot', 'w', encoding='utf-8') as f:
+                f.write(text)
+        self._pending_dot = []
+
+    @staticmethod
+    def _render_png(path: str, text: str):
+        from graphviz import Source
+        with stage('render_png'):
+            Source(text).render(path, format='png', cleanup=True)
+        return f'{path}.png'
+
+    def flush(self) -> list:
+        """Escribe los .dot pendientes y espera los PNG en curso; devuelve los errores"""
+        self._write_dot_batch()
+        errors = []
+        for future in self._futures:
+            exc = future.exception()
+            if exc is not None:
+                errors.append(exc)
+        self._futures = []
+        return errors
+
+    def close(self) -> list:
+        errors = self.flush()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        return errors
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        for error in self.close():
+            print(f"Error de renderizado: {error}")
@@ -0,0 +1,178 @@
+import mmap
+from collections import deque
+from itertools import islice
+from dfa import CompiledDFA
+
+
+def _compiled(dfa) -> CompiledDFA:
+    return dfa if isinstance(dfa, CompiledDFA) else dfa.compile()
+
+
+def _byte_columns(compiled: CompiledDFA) -> list:
+    """Columna de cada byte (0-255), interpretando el byte como carácter latin-1"""
+    return [compiled.column(chr(b)) for b in range(256)]
+
+
+def search_stream(dfa, chunks, max_history: int | None = None):
+    """
+    Búsqueda no anclada sobre una secuencia de fragmentos (str, bytes o memoryview).
+    Genera tuplas (inicio, fin) con los desplazamientos globales de las
+    coincidencias más a la izquierda y más largas, sin solaparse.
+    Las coincidencias vacías no se reportan. El estado del autómata se
+    conserva entre fragmentos, así que una coincidencia puede cruzarlos.
+
+    Peor caso: una coincidencia pendiente no se emite mientras siga vivo un
+    hilo que empezó antes o en el mismo punto, y hasta entonces se guardan
+    las columnas desde su fin para reprocesarlas. Con 'a|ab*c' sobre
+    'a' + 'b'*n eso es O(n) de memoria; max_history acota esas columnas y
+    lanza ValueError al superarlo. Cada coincidencia emitida reprocesa desde
+    su fin hasta la posición actual, así que el tiempo es O(n·k) en el caso
+    común (k estados del DFA) y O(n²·k) en el peor ('a|a(a)*c' sobre 'a'*n).
+    """
+    return _search(_compiled(dfa), chunks, None, max_history)
+
+
+def _search(compiled: CompiledDFA, chunks, buffer, max_history):
+    """
+    Núcleo de la búsqueda. Si buffer es el texto completo (str o buffer de
+    bytes), el reproceso lee de él en lugar de guardar columnas.
+    """
+    table, ncols, dead = compiled.table, compiled.ncols, compiled.dead
+    accepting, start_state = compiled.accepting, compiled.start
+    cols, column = compiled.cols, compiled.column
+    byte_cols = None
+
+    def step(threads, ends, col, p):
+        """Inicia un hilo en p, avanza todos con la columna col y registra aceptaciones"""
+        if start_state not in threads:
+            threads[start_state] = p
+        advanced = {}
+        for state, begin in threads.items():
+            target = table[state * ncols + col]
+            if target == dead:
+                continue
+            if target not in advanced or begin < advanced[target]:
+                advanced[target] = begin
+        for state, begin in advanced.items():
+            if accepting[state]:
+                ends[begin] = p + 1
+        return advanced
+
+    threads = {}        # estado -> inicio más a la izquierda que llega a él
+    ends = {}           # inicio -> fin más largo aceptado hasta ahora
+    history = deque()   # columnas desde la posición base (para reprocesar)
+    base = 0
+    pos = 0
+    data = None
+
+    if buffer is None:
+        def replay(first, last):
+            return islice(history, first - base, last - base)
+    elif isinstance(buffer, str):
+        def replay(first, last):
+            return (cols[ch] if ch in cols else column(ch) for ch in map(buffer.__getitem__, range(first, last)))
+    else:
+        byte_cols = _byte_columns(compiled)
+        data = memoryview(buffer).cast('B')
+
+        def replay(first, last):
+            return (byte_cols[data[p]] for p in range(first, last))
+
+    def emit_and_replay():
+        """Emite la coincidencia más a la izquierda y reprocesa desde su fin"""
+        nonlocal threads, ends
+        first = min(ends)
+        resume = ends[first]
+        threads, ends = {}, {}
+        # Los hilos fusionados con otros anteriores se recuperan reprocesando
+        for p, col in enumerate(replay(resume, pos), resume):
+            threads = step(threads, ends, col, p)
+        return first, resume
+
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                columns = (cols[ch] if ch in cols else column(ch) for ch in chunk)
+            else:
+                if byte_cols is None:
+                    byte_cols = _byte_columns(compiled)
+                columns = (byte_cols[b] for b in memoryview(chunk).cast('B'))
+
+            for col in columns:
+                if buffer is None:
+                    history.append(col)
+                    if max_history is not None and len(history) > max_history:
+                        raise ValueError(f"La búsqueda necesita guardar más de {max_history} columnas")
+                threads = step(threads, ends, col, pos)
+                pos += 1
+
+                # Emitir mientras ningún hilo vivo pueda dar una coincidencia
+                # más a la izquierda o más larga que la pendiente
+                while ends:
+                    first = min(ends)
+                    if any(begin <= first for begin in threads.values()):
+                        break
+                    yield emit_and_replay()
+
+                # El reproceso siempre arranca en el fin de una coincidencia pendiente
+                if buffer is None:
+                    keep = min(ends.values(), default=pos)
+                    while base < keep:
+                        history.popleft()
+                        base += 1
+
+        while ends:
+            yield emit_and_replay()
+    finally:
+        if data is not None:
+            data.release()
+
+
+def search(dfa, text):
+    """
+    Búsqueda no anclada sobre una cadena o buffer completo en memoria.
+    El reproceso lee directamente de text, sin copiar columnas; el tiempo en
+    el peor caso es el mismo que en search_stream.
+    """
+    return _search(_compiled(dfa), [text], text, None)
+
+
+def _read_chunks(f, chunk_size: int):
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def search_file(dfa, path: str, chunk_size: int = 1 << 16, use_mmap: bool = False, encoding: str | None = None,
+                max_history: int | None = None):
+    """
+    Busca en un archivo sin cargarlo completo en memoria.
+    Sin encoding los desplazamientos son en bytes; con encoding, en caracteres.
+    Con use_mmap=True el archivo se recorre directamente desde el mapeo y el
+    reproceso relee del mapeo, así que la memoria no depende del texto.
+    Por fragmentos, la memoria y el tiempo en el peor caso son los de
+    search_stream (O(n) columnas guardadas, acotables con max_history, y
+    O(n²·k) pasos).
+    """
+    compiled = _compiled(dfa)
+    if encoding is not None:
+        with open(path, 'r', encoding=encoding) as f:
+            yield from search_stream(compiled, _read_chunks(f, chunk_size), max_history)
+        return
+
+    with open(path, 'rb') as f:
+        if use_mmap:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # archivo vacío
+                return
+            with mm:
+                view = memoryview(mm)
+                try:
+                    yield from _search(compiled, [view], view, None)
+                finally:
+                    view.release()
+        else:
+            yield from search_stream(compiled, _read_chunks(f, chunk_size), max_history)
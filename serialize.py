@@ -0,0 +1,325 @@
+"""
+Formato binario versionado para NFA y DFA.
+
+Todas las secciones están alineadas a 4 bytes y los enteros son int32
+little-endian, de modo que un archivo mapeado con mmap puede usarse
+directamente con memoryview.cast('i') sin convertirlo a diccionarios.
+
+Cabecera (HEADER): magic, versión, tipo, número de símbolos, número de
+estados, estado inicial, dato extra (estado dead en DFA, aristas en NFA)
+y longitud de la tabla de símbolos.
+
+DFA: tabla de símbolos, tabla de transiciones (estados x (símbolos + 1)),
+     bitmap de aceptación.
+NFA: tabla de símbolos, offsets CSR (estados + 1), símbolo de cada arista
+     (-1 = ε), destino de cada arista, bitmap de aceptación.
+"""
+import mmap
+import struct
+import sys
+from array import array
+from thompson import NFA
+from dfa import DFA, CompiledDFA
+from shunting_yard import label_matches
+from alphabet import SymbolClasses
+
+MAGIC = b'AUTM'
+VERSION = 1
+KIND_DFA = 0
+KIND_NFA = 1
+HEADER = struct.Struct('<4sHBxIIIII')
+EPSILON = -1
+
+
+def _pad(data: bytearray):
+    data.extend(b'\0' * (-len(data) % 4))
+
+
+def _int32(values) -> bytes:
+    arr = array('i', values)
+    if sys.byteorder != 'little':
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _symbol_table(symbols) -> bytes:
+    data = bytearray()
+    for symbol in symbols:
+        raw = symbol.encode('utf-8')
+        data += struct.pack('<H', len(raw)) + raw
+    _pad(data)
+    return bytes(data)
+
+
+def _bitmap(n: int, members) -> bytes:
+    bits = bytearray((n + 7) // 8)
+    for i in members:
+        bits[i >> 3] |= 1 << (i & 7)
+    return bytes(bits)
+
+
+def dfa_to_bytes(dfa: DFA) -> bytes:
+    compiled = dfa if isinstance(dfa, CompiledDFA) else dfa.compile()
+    nstates = compiled.dead + 1
+    symtab = _symbol_table(compiled.symbols)
+    accepts = [i for i in range(nstates) if compiled.accepting[i]]
+    return b''.join([
+        HEADER.pack(MAGIC, VERSION, KIND_DFA, len(compiled.symbols), nstates,
+                    compiled.start, compiled.dead, len(symtab)),
+        symtab,
+        _int32(compiled.table),
+        _bitmap(nstates, accepts),
+    ])
+
+
+def nfa_to_bytes(nfa: NFA) -> bytes:
+    states = sorted(nfa.states())
+    index = {q: i for i, q in enumerate(states)}
+    symbols = sorted({sym for lst in nfa.transitions.values() for sym, _ in lst if sym != 'ε'})
+    sym_index = {sym: i for i, sym in enumerate(symbols)}
+
+    offsets, edge_sym, edge_dst = [0], [], []
+    for q in states:
+        for sym, v in nfa.transitions.get(q, []):
+            edge_sym.append(EPSILON if sym == 'ε' else sym_index[sym])
+            edge_dst.append(index[v])
+        offsets.append(len(edge_dst))
+
+    symtab = _symbol_table(symbols)
+    return b''.join([
+        HEADER.pack(MAGIC, VERSION, KIND_NFA, len(symbols), len(states),
+                    index[nfa.start], len(edge_dst), len(symtab)),
+        symtab,
+        _int32(offsets),
+        _int32(edge_sym),
+        _int32(edge_dst),
+        _bitmap(len(states), (index[a] for a in nfa.accepts)),
+    ])
+
+
+def dump_dfa(dfa: DFA, path: str):
+    with open(path, 'wb') as f:
+        f.write(dfa_to_bytes(dfa))
+
+
+def dump_nfa(nfa: NFA, path: str):
+    with open(path, 'wb') as f:
+        f.write(nfa_to_bytes(nfa))
+
+
+class _MappedAutomaton:
+    """Base común: valida la cabecera y lee la tabla de símbolos del buffer"""
+
+    def __init__(self, buffer, expected_kind: int):
+        if sys.byteorder != 'little':
+            raise ValueError("El formato binario requiere un host little-endian")
+        self._file = None
+        self._mmap = None
+        # La cabecera se valida antes de exportar vistas del buffer
+        if len(buffer) < HEADER.size:
+            raise ValueError("No es un archivo de autómata válido")
+        magic, version, kind, nsym, nstates, start, extra, symtab_len = HEADER.unpack_from(buffer)
+        if magic != MAGIC:
+            raise ValueError("No es un archivo de autómata válido")
+        if version != VERSION:
+            raise ValueError(f"Versión de formato no soportada: {version}")
+        if kind != expected_kind:
+            raise ValueError(f"Tipo de autómata inesperado: {kind}")
+        if start >= nstates:
+            raise ValueError(f"Estado inicial fuera de rango: {start}")
+
+        self._buffer = memoryview(buffer)
+        self.nstates = nstates
+        self.start = start
+        self._extra = extra
+        self.symbols = []
+        pos = HEADER.size
+        for _ in range(nsym):
+            self._need(pos + 2)
+            (length,) = struct.unpack_from('<H', self._buffer, pos)
+            self._need(pos + 2 + length)
+            try:
+                self.symbols.append(bytes(self._buffer[pos + 2:pos + 2 + length]).decode('utf-8'))
+            except UnicodeDecodeError:
+                self._invalid("Tabla de símbolos inválida")
+            pos += 2 + length
+        self._pos = HEADER.size + symtab_len
+
+    def _invalid(self, message: str):
+        """Libera las vistas ya tomadas y rechaza el archivo"""
+        self.close()
+        raise ValueError(message) from None
+
+    def _need(self, end: int):
+        """Falla si el buffer termina antes de end"""
+        if end > len(self._buffer):
+            self._invalid("Archivo de autómata truncado")
+
+    def _check_range(self, view, low: int, high: int, what: str):
+        """Falla si algún valor de view queda fuera de [low, high)"""
+        if len(view) and (min(view) < low or max(view) >= high):
+            self._invalid(f"{what} fuera de rango")
+
+    def _take(self, count: int):
+        self._need(self._pos + 4 * count)
+        view = self._buffer[self._pos:self._pos + 4 * count].cast('i')
+        self._pos += 4 * count
+        return view
+
+    def _take_bitmap(self, n: int):
+        self._need(self._pos + (n + 7) // 8)
+        view = self._buffer[self._pos:self._pos + (n + 7) // 8]
+        self._pos += (n + 7) // 8
+        return view
+
+    def is_accept(self, state: int) -> bool:
+        return bool(self._accepts[state >> 3] >> (state & 7) & 1)
+
+    def close(self):
+        # Liberar las vistas antes de cerrar el mmap
+        for name in [n for n, v in vars(self).items() if isinstance(v, memoryview)]:
+            getattr(self, name).release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._file.close()
+            self._mmap = self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class MappedDFA(_MappedAutomaton):
+    """DFA que simula directamente sobre el buffer serializado"""
+
+    def __init__(self, buffer):
+        super().__init__(buffer, KIND_DFA)
+        # Los símbolos son caracteres o clases '[...]'; las clases se resuelven con classify
+        self.classes = SymbolClasses(self.symbols) if any(len(symbol) > 1 for symbol in self.symbols) else None
+        self.cols = {symbol: col for col, symbol in enumerate(self.symbols)}
+        self.dead = self._extra
+        if self.dead >= self.nstates:
+            self._invalid(f"Estado dead fuera de rango: {self.dead}")
+        self.ncols = len(self.symbols) + 1
+        self.table = self._take(self.nstates * self.ncols)
+        self._check_range(self.table, 0, self.nstates, "Transición")
+        self._accepts = self._take_bitmap(self.nstates)
+
+    def column(self, ch: str) -> int:
+        col = self.cols.get(ch)
+        if col is None and self.classes is not None:
+            col = self.cols.get(self.classes.classify(ch))
+        return self.ncols - 1 if col is None else col
+
+    def accepts_string(self, w: str) -> bool:
+        table, cols, column, ncols = self.table, self.cols, self.column, self.ncols
+        current, dead = self.start, self.dead
+        for symbol in w:
+            try:
+                col = cols[symbol]
+            except KeyError:
+                col = column(symbol)
+            current = table[current * ncols + col]
+            if current == dead:
+                return False
+        return self.is_accept(current)
+
+    def to_dfa(self) -> DFA:
+        """Reconstruye un dfa.DFA con diccionarios (sin el estado dead)"""
+        transitions = {}
+        for state in range(self.nstates):
+            if state == self.dead:
+                continue
+            row = transitions[state] = {}
+            for col, symbol in enumerate(self.symbols):
+                target = self.table[state * self.ncols + col]
+                if target != self.dead:
+                    row[symbol] = target
+        accepts = {s for s in range(self.nstates) if self.is_accept(s)}
+        return DFA(self.start, accepts, transitions, set(self.symbols), self.classes)
+
+
+class MappedNFA(_MappedAutomaton):
+    """NFA en formato CSR que simula directamente sobre el buffer serializado"""
+
+    def __init__(self, buffer):
+        super().__init__(buffer, KIND_NFA)
+        self.offsets = self._take(self.nstates + 1)
+        self.edge_sym = self._take(self._extra)
+        self.edge_dst = self._take(self._extra)
+        # Offsets CSR: empiezan en 0, no decrecen y terminan en el número de aristas
+        offsets = self.offsets
+        if offsets[0] != 0 or offsets[-1] != self._extra or any(a > b for a, b in zip(offsets, offsets[1:])):
+            self._invalid("Offsets de aristas inválidos")
+        self._check_range(self.edge_sym, EPSILON, len(self.symbols), "Símbolo de arista")
+        self._check_range(self.edge_dst, 0, self.nstates, "Destino de arista")
+        self._accepts = self._take_bitmap(self.nstates)
+        # El bitmap de aceptación (bit i del byte i >> 3) leído como entero little-endian
+        self.accept_mask = int.from_bytes(self._accepts, 'little')
+        self._matching = {}
+
+    def matching_symbols(self, ch: str) -> frozenset:
+        """Índices de las etiquetas que aceptan el carácter (una clase puede cubrir varios)"""
+        found = self._matching.get(ch)
+        if found is None:
+            found = self._matching[ch] = frozenset(
+                i for i, label in enumerate(self.symbols) if label_matches(label, ch))
+        return found
+
+    def _closure(self, mask: int) -> int:
+        offsets, edge_sym, edge_dst = self.offsets, self.edge_sym, self.edge_dst
+        stack = []
+        rest = mask
+        while rest:
+            low = rest & -rest
+            stack.append(low.bit_length() - 1)
+            rest ^= low
+        while stack:
+            s = stack.pop()
+            for e in range(offsets[s], offsets[s + 1]):
+                v = edge_dst[e]
+                if edge_sym[e] == EPSILON and not mask >> v & 1:
+                    mask |= 1 << v
+                    stack.append(v)
+        return mask
+
+    def accepts_string(self, w: str) -> bool:
+        offsets, edge_sym, edge_dst = self.offsets, self.edge_sym, self.edge_dst
+        current = self._closure(1 << self.start)
+        for ch in w:
+            matching = self.matching_symbols(ch)
+            if not matching:
+                return False
+            nxt = 0
+            while current:
+                low = current & -current
+                s = low.bit_length() - 1
+                for e in range(offsets[s], offsets[s + 1]):
+                    if edge_sym[e] in matching:
+                        nxt |= 1 << edge_dst[e]
+                current ^= low
+            if not nxt:
+                return False
+            current = self._closure(nxt)
+        return bool(current & self.accept_mask)
+
+
+def load(path: str):
+    """Mapea un archivo con mmap y devuelve un MappedDFA o MappedNFA"""
+    f = open(path, 'rb')
+    try:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:  # archivo vacío
+        f.close()
+        raise ValueError("No es un archivo de autómata válido") from None
+    try:
+        kind = HEADER.unpack_from(mm)[2] if len(mm) >= HEADER.size else None
+        automaton = MappedDFA(mm) if kind == KIND_DFA else MappedNFA(mm)
+    except BaseException:
+        mm.close()
+        f.close()
+        raise
+    automaton._file, automaton._mmap = f, mm
+    return automaton
@@ -1,4 +1,4 @@
-from graphviz import Digraph
+from functools import lru_cache
 
 class Node:
     def __init__(self, value, left=None, right=None):
@@ -7,40 +7,121 @@ class Node:
         self.right = right
 
 
-def expand_regex(regex: str) -> str:
-    result = ''
+class Group(Node):
+    """Subexpresión entre paréntesis que captura; index empieza en 1 (0 es la coincidencia completa)"""
+    def __init__(self, index, child):
+        super().__init__('()', child)
+        self.index = index
+
+
+def tokenize_regex(regex: str) -> list:
+    """
+    Divide la expresión en unidades: cada clase de caracteres '[...]'
+    es un único token y el resto de caracteres son tokens individuales.
+    """
+    tokens = []
     i = 0
     while i < len(regex):
-        c = regex[i]
-
-        if i + 1 < len(regex) and regex[i + 1] in {'+', '?'}:
-            op = regex[i + 1]
-            if c == ')':
-                j = i
-                count = 0
-                while j >= 0:
-                    if regex[j] == ')':
-                        count += 1
-                    elif regex[j] == '(':
-                        count -= 1
-                        if count == 0:
-                            break
-                    j -= 1
-                group = regex[j:i+1]
-                if op == '+':
-                    result += f"{group}.{group}*"
-                else:
-                    result += f"{group}|ε"
+        if regex[i] == '[':
+            j = regex.find(']', i + 1)
+            if j == -1:
+                raise ValueError(f"Clase de caracteres sin cerrar en la posición {i}: {regex}")
+            if j == i + 1:
+                raise ValueError(f"Clase de caracteres vacía en la posición {i}: {regex}")
+            tokens.append(regex[i:j + 1])
+            i = j + 1
+        else:
+            tokens.append(regex[i])
+            i += 1
+    return tokens
+
+
+def is_char_class(label: str) -> bool:
+    return len(label) > 2 and label[0] == '[' and label[-1] == ']'
+
+
+@lru_cache(maxsize=None)
+def parse_char_class(label: str) -> tuple:
+    """
+    Convierte una clase como '[a-z0-9_]' en rangos ordenados y disjuntos
+    ((lo, hi), ...). Un '-' al inicio o al final es literal.
+    """
+    body = label[1:-1]
+    ranges = []
+    i = 0
+    while i < len(body):
+        if i + 2 < len(body) and body[i + 1] == '-':
+            lo, hi = body[i], body[i + 2]
+            if lo > hi:
+                raise ValueError(f"Rango inválido '{lo}-{hi}' en {label}")
+            ranges.append((lo, hi))
+            i += 3
+        else:
+            ranges.append((body[i], body[i]))
+            i += 1
+
+    # Unir rangos solapados o contiguos
+    ranges.sort()
+    merged = [ranges[0]]
+    for lo, hi in ranges[1:]:
+        last_lo, last_hi = merged[-1]
+        if ord(lo) <= ord(last_hi) + 1:
+            merged[-1] = (last_lo, max(last_hi, hi))
+        else:
+            merged.append((lo, hi))
+    return tuple(merged)
+
+
+def label_ranges(label: str) -> tuple:
+    """Rangos de caracteres que cubre la etiqueta de una transición"""
+    return parse_char_class(label) if is_char_class(label) else ((label, label),)
+
+
+def label_matches(label: str, ch: str) -> bool:
+    if label == ch:
+        return True
+    if not is_char_class(label):
+        return False
+    return any(lo <= ch <= hi for lo, hi in parse_char_class(label))
+
+
+def label_chars(label: str) -> list:
+    """Enumera los caracteres que cubre la etiqueta"""
+    return [chr(c) for lo, hi in label_ranges(label) for c in range(ord(lo), ord(hi) + 1)]
+
+
+def expand_regex(regex: str) -> str:
+    """
+    Reescribe textualmente X+ como (X.X*) y X? como (X|ε).
+    Ya no es parte del pipeline (el AST soporta '+' y '?' de forma nativa);
+    se conserva para quien necesite la forma expandida.
+    """
+    tokens = tokenize_regex(regex)
+    out = []
+    open_positions = []  # posición en out de cada '(' abierto
+    i = 0
+    while i < len(tokens):
+        c = tokens[i]
+        if c == '(':
+            open_positions.append(len(out))
+            out.append(c)
+            i += 1
+            continue
+
+        out.append(c)
+        group_start = open_positions.pop() if c == ')' else len(out) - 1
+
+        if i + 1 < len(tokens) and tokens[i + 1] in {'+', '?'}:
+            group = ''.join(out[group_start:])
+            del out[group_start:]
+            if tokens[i + 1] == '+':
+                out.append(f"({group}.{group}*)")
             else:
-                if op == '+':
-                    result += f"{c}.{c}*"
-                else:
-                    result += f"{c}|ε"
+                out.append(f"({group}|ε)")
             i += 2
         else:
-            result += c
             i += 1
-    return result
+    return ''.join(out)
 
 
 def get_precedence(c: str) -> int:
@@ -57,40 +138,55 @@ def get_precedence(c: str) -> int:
 
 
 def format_regex(regex: str) -> str:
-    res = ""
+    res = []
     all_ops = {'|', '?', '+', '*', '.', '^'}
     binarios = {'*', '+', '?'}
 
     def is_operand(c: str) -> bool:
-        return c not in all_ops and c not in {'(', ')', '[', ']', '{', '}'}
+        # Una clase de caracteres completa es un operando
+        return is_char_class(c) or (c not in all_ops and c not in {'(', ')', '[', ']', '{', '}'})
 
-    i = 0
-    while i < len(regex) - 1:
-        c1 = regex[i]
-        c2 = regex[i + 1]
-        res += c1
+    tokens = tokenize_regex(regex)
+    for c1, c2 in zip(tokens, tokens[1:]):
+        res.append(c1)
 
         if (
-            (is_operand(c1) or c1 in binarios or c1 in {')', ']'}) and
-            (is_operand(c2) or c2 in {'(', '['})
+            (is_operand(c1) or c1 in binarios or c1 == ')') and
+            (is_operand(c2) or c2 == '(')
         ):
-            res += '.'
-        i += 1
+            res.append('.')
 
-    if i < len(regex):
-        res += regex[-1]
-    return res
+    if tokens:
+        res.append(tokens[-1])
+    return ''.join(res)
+
+
+def capture_order(regex: str) -> list:
+    """Número de cada grupo (por orden de apertura) listado en el orden en que se cierran"""
+    order, open_groups, count = [], [], 0
+    for c in tokenize_regex(regex):
+        if c == '(':
+            count += 1
+            open_groups.append(count)
+        elif c == ')':
+            order.append(open_groups.pop())
+    return order
 
 
-def infix_to_postfix(regex: str) -> str:
+def infix_to_postfix(regex: str, verbose: bool = False, captures: bool = False) -> str:
+    """
+    Con captures=True cada ')' se conserva en la salida como operador unario
+    de cierre de grupo (ver postfix_to_ast).
+    """
     output = ''
     stack = []
     formatted = format_regex(regex)
-    print(f"\nInfix original : {regex}")
+    if verbose:
+        print(f"\nInfix original : {regex}")
     #print(f"Infix formateado: {formatted}")
     #print("Pasos de conversión:")
 
-    for c in formatted:
+    for c in tokenize_regex(formatted):
         if c == '(':
             stack.append(c)
             #print(f"Push '(': {stack}")
@@ -100,6 +196,8 @@ def infix_to_postfix(regex: str) -> str:
                 #print(f"Pop hasta '(': salida = {output}, stack = {stack}")
             stack.pop()
             #print(f"Eliminar '(': {stack}")
+            if captures:
+                output += ')'
         elif c in "|.+?^*":
             while stack and get_precedence(stack[-1]) >= get_precedence(c):
                 output += stack.pop()
@@ -114,26 +212,35 @@ def infix_to_postfix(regex: str) -> str:
         output += stack.pop()
         #print(f"Vaciar stack: salida = {output}")
 
-    print(f"Postfix final  : {output}")
+    if verbose:
+        print(f"Postfix final  : {output}")
     return output
 
 
-def postfix_to_ast(postfix: str):
+def postfix_to_ast(postfix: str, groups: list | None = None):
+    """
+    groups es la salida de capture_order: con él, cada ')' del postfix
+    (infix_to_postfix con captures=True) envuelve el operando en un Group.
+    """
     stack = []
-    for token in postfix:
+    closed = iter(groups or ())
+    for token in tokenize_regex(postfix):
         if token in {'.', '|'}:
             right = stack.pop()
             left = stack.pop()
             stack.append(Node(token, left, right))
-        elif token in {'*'}:
+        elif token in {'*', '+', '?'}:
             node = stack.pop()
             stack.append(Node(token, node))
+        elif token == ')':
+            stack.append(Group(next(closed), stack.pop()))
         else:
             stack.append(Node(token))
     return stack[0] if stack else None
 
 
 def draw_ast(root, filename='ast'):
+    from graphviz import Digraph  # Importación diferida: solo al renderizar
     dot = Digraph()
 
     def add_nodes_edges(node, counter=[0]):
@@ -155,8 +262,8 @@ def draw_ast(root, filename='ast'):
         print(f"Árbol generado: {filename}.png")
 
 
-def build_ast_from_infix(regex: str):
-    expanded = expand_regex(regex)
-    postfix = infix_to_postfix(expanded)
-    ast = postfix_to_ast(postfix)
+def build_ast_from_infix(regex: str, expand: bool = False, captures: bool = False):
+    expanded = expand_regex(regex) if expand else regex
+    postfix = infix_to_postfix(expanded, captures=captures)
+    ast = postfix_to_ast(postfix, capture_order(expanded) if captures else None)
     return expanded, postfix, ast
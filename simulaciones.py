@@ -1,6 +1,11 @@
 from thompson import NFA
+from shunting_yard import label_matches
+from alphabet import SymbolClasses
+from profiling import PROFILER
 
 def epsilon_closure(nfa: NFA, states):
+    if PROFILER.enabled:
+        PROFILER.count('epsilon_closures')
     stack, closure = list(states), set(states)
     while stack:
         s = stack.pop()
@@ -14,7 +19,7 @@ def move(nfa: NFA, states, symbol: str):
     res = set()
     for s in states:
         for sym,v in nfa.transitions.get(s, []):
-            if sym == symbol: res.add(v)
+            if sym != 'ε' and label_matches(sym, symbol): res.add(v)
     return res
 
 
@@ -23,3 +28,131 @@ def nfa_accepts(nfa: NFA, w: str) -> bool:
     for ch in w:
         current = epsilon_closure(nfa, move(nfa, current, ch))
     return any(q in nfa.accepts for q in current)
+
+
+class CompiledNFA:
+    """
+    Versión compilada de un NFA para simulación con máscaras de bits.
+    Solo los estados relevantes (con alguna arista no ε, o de aceptación)
+    reciben un bit: los estados puramente ε no cambian el comportamiento.
+    El cierre epsilon de cada estado se obtiene una sola vez componiendo los
+    cierres de sus sucesores sobre las componentes fuertemente conexas del
+    grafo ε, y el conjunto activo es un entero.
+    Las tablas de movimiento se indexan por clase de equivalencia del alfabeto
+    (una clase '[\x00-\xff]' ocupa una sola fila) y son dispersas: para cada
+    clase, la máscara de estados que tienen arista con ella y, por cada uno,
+    el cierre de sus destinos.
+    """
+    __slots__ = ('index', 'start_mask', 'accept_mask', 'classes', 'moves')
+
+    def __init__(self, nfa: NFA):
+        labels = {sym for lst in nfa.transitions.values() for sym, _ in lst if sym != 'ε'}
+        relevant = {u for u, lst in nfa.transitions.items() if any(sym != 'ε' for sym, _ in lst)} | nfa.accepts
+        self.index = {q: i for i, q in enumerate(sorted(relevant))}
+        closures = _epsilon_closure_masks(nfa, self.index)
+
+        # moves[clase] = (máscara de orígenes, {bit de origen: cierre de los destinos})
+        self.classes = SymbolClasses(labels)
+        self.moves = {}
+        for u, lst in nfa.transitions.items():
+            for sym, v in lst:
+                if sym == 'ε':
+                    continue
+                i = self.index[u]
+                for name in self.classes.label_classes[sym]:
+                    sources, row = self.moves.get(name, (0, None))
+                    if row is None:
+                        row = {}
+                    row[i] = row.get(i, 0) | closures[v]
+                    self.moves[name] = (sources | 1 << i, row)
+
+        self.start_mask = closures[nfa.start]
+        self.accept_mask = 0
+        for a in nfa.accepts:
+            self.accept_mask |= 1 << self.index[a]
+
+    def step(self, current: int, symbol: str) -> int:
+        """Avanza la máscara con un carácter"""
+        return self.step_class(current, self.classes.classify(symbol))
+
+    def step_class(self, current: int, name) -> int:
+        """Avanza la máscara con una clase del alfabeto (None: fuera del alfabeto)"""
+        entry = self.moves.get(name)
+        if entry is None:
+            return 0
+        sources, row = entry
+        current &= sources
+        nxt = 0
+        while current:
+            low = current & -current
+            nxt |= row[low.bit_length() - 1]
+            current ^= low
+        return nxt
+
+    def accepts_string(self, w: str) -> bool:
+        current = self.start_mask
+        for ch in w:
+            current = self.step(current, ch)
+            if not current:
+                return False
+        return bool(current & self.accept_mask)
+
+
+def _epsilon_closure_masks(nfa: NFA, index: dict) -> dict:
+    """
+    Cierre epsilon de cada estado como máscara sobre los bits de index.
+    Tarjan iterativo sobre las aristas ε: cada componente se cierra una vez
+    (al completarse, sus sucesores ya están cerrados), uniendo con OR los
+    cierres de las componentes sucesoras.
+    """
+    eps = {u: [v for sym, v in lst if sym == 'ε'] for u, lst in nfa.transitions.items()}
+    closures = {}
+    order, low, on_stack = {}, {}, set()
+    scc_stack = []
+    for root in nfa.states():
+        if root in order:
+            continue
+        work = [(root, iter(eps.get(root, ())))]
+        order[root] = low[root] = len(order)
+        scc_stack.append(root)
+        on_stack.add(root)
+        while work:
+            u, successors = work[-1]
+            for v in successors:
+                if v not in order:
+                    order[v] = low[v] = len(order)
+                    scc_stack.append(v)
+                    on_stack.add(v)
+                    work.append((v, iter(eps.get(v, ()))))
+                    break
+                if v in on_stack:
+                    low[u] = min(low[u], order[v])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[u])
+                if low[u] == order[u]:
+                    # Componente completa: sus miembros comparten el mismo cierre
+                    members = []
+                    while True:
+                        v = scc_stack.pop()
+                        on_stack.discard(v)
+                        members.append(v)
+                        if v == u:
+                            break
+                    mask = 0
+                    for v in members:
+                        if v in index:
+                            mask |= 1 << index[v]
+                        for w in eps.get(v, ()):
+                            if w in closures:
+                                mask |= closures[w]
+                    for v in members:
+                        closures[v] = mask
+    return closures
+
+
+def nfa_accepts_bitset(nfa: NFA, w: str) -> bool:
+    """Equivalente a nfa_accepts usando la simulación con máscaras de bits (compilada una vez por NFA)"""
+    return nfa.compiled().accepts_string(w)
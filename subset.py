@@ -1,4 +1,4 @@
-from simulaciones import epsilon_closure, move
+from collections import deque
 from dfa import DFA
 
 def get_alphabet(nfa) -> set:
@@ -11,52 +11,80 @@ def get_alphabet(nfa) -> set:
     return alphabet
 
 
-def subset_construction(nfa) -> DFA:
+class StateLimitError(ValueError):
+    """La construcción de subconjuntos superó el máximo de estados permitido"""
+
+    def __init__(self, max_states: int, partial: DFA):
+        super().__init__(f"La construcción de subconjuntos superó el límite de {max_states} estados")
+        self.max_states = max_states
+        self.partial = partial
+
+
+def determinize(compiled, max_states: int | None = None):
     """
-    Algoritmo de construcción de subconjuntos para convertir NFA a DFA
+    Bucle de la construcción de subconjuntos sobre un NFA compilado.
+    Devuelve (masks, transitions, limited): la máscara de estados del NFA de
+    cada estado del DFA (el inicial es 0), las transiciones por clase y si se
+    descartaron estados nuevos por superar max_states. La numeración sigue un
+    BFS con las clases en orden, así que no depende del hash de los símbolos.
     """
-    alphabet = get_alphabet(nfa)
-    
+    # Todos los caracteres de una clase se comportan igual: un paso por clase
+    symbols = sorted(compiled.classes.names)
+    step = compiled.step_class
+
     # Estado inicial del DFA es el cierre epsilon del estado inicial del NFA
-    initial_state = frozenset(epsilon_closure(nfa, {nfa.start}))
-    
-    dfa_states = {initial_state}
-    dfa_transitions = {}
-    dfa_accepts = set()
-    unprocessed = [initial_state]
-    
+    ids = {compiled.start_mask: 0}   # tabla de internado: máscara -> estado del DFA
+    masks = [compiled.start_mask]
+    transitions = {}
+    unprocessed = deque([0])
+    limited = False
+
     while unprocessed:
-        current_dfa_state = unprocessed.pop(0)
-        dfa_transitions[current_dfa_state] = {}
-        
-        if any(nfa_state in nfa.accepts for nfa_state in current_dfa_state):
-            dfa_accepts.add(current_dfa_state)
-        
-        for symbol in alphabet:
-            next_nfa_states = move(nfa, current_dfa_state, symbol)
-            next_dfa_state = frozenset(epsilon_closure(nfa, next_nfa_states))
-            
-            if next_dfa_state:
-                dfa_transitions[current_dfa_state][symbol] = next_dfa_state
-                if next_dfa_state not in dfa_states:
-                    dfa_states.add(next_dfa_state)
-                    unprocessed.append(next_dfa_state)
-    
-    # Mapear estados a enteros
-    state_map = {state: i for i, state in enumerate(dfa_states)}
-    numeric_transitions = {}
-    
-    for dfa_state, transitions in dfa_transitions.items():
-        numeric_state = state_map[dfa_state]
-        numeric_transitions[numeric_state] = {}
-        for symbol, target_state in transitions.items():
-            numeric_transitions[numeric_state][symbol] = state_map[target_state]
-    
-    numeric_accepts = {state_map[state] for state in dfa_accepts}
-    
-    return DFA(
-        start=state_map[initial_state],
-        accepts=numeric_accepts,
-        transitions=numeric_transitions,
-        alphabet=alphabet
+        state = unprocessed.popleft()
+        mask = masks[state]
+        row = transitions[state] = {}
+
+        for symbol in symbols:
+            target = step(mask, symbol)
+            if not target:
+                continue
+
+            target_state = ids.get(target)
+            if target_state is None:
+                if max_states is not None and len(masks) >= max_states:
+                    limited = True
+                    continue
+                target_state = ids[target] = len(masks)
+                masks.append(target)
+                unprocessed.append(target_state)
+            row[symbol] = target_state
+
+    return masks, transitions, limited
+
+
+def subset_construction(nfa, max_states: int | None = None, on_limit: str = 'error') -> DFA:
+    """
+    Algoritmo de construcción de subconjuntos para convertir NFA a DFA.
+    Las columnas del DFA son las clases de equivalencia del alfabeto.
+    Los subconjuntos son máscaras de bits sobre el NFA compilado (cierres
+    epsilon precalculados y, por clase, solo los estados con arista en ella).
+    Si se supera max_states: on_limit='error' lanza StateLimitError y
+    on_limit='partial' devuelve el DFA parcial (sin las transiciones hacia
+    estados nuevos que ya no caben).
+    """
+    if on_limit not in {'error', 'partial'}:
+        raise ValueError(f"Política de límite no soportada: {on_limit}")
+    compiled = nfa.compiled()
+    masks, transitions, limited = determinize(compiled, max_states)
+    accepts = {state for state, mask in enumerate(masks) if mask & compiled.accept_mask}
+
+    dfa = DFA(
+        start=0,
+        accepts=accepts,
+        transitions=transitions,
+        alphabet=set(compiled.classes.names),
+        classes=compiled.classes
     )
+    if limited and on_limit == 'error':
+        raise StateLimitError(max_states, dfa)
+    return dfa
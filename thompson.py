@@ -1,14 +1,66 @@
-from graphviz import Digraph
 from shunting_yard import Node
+from array import array
+
 
 class NFA:
-    def __init__(self, start, accepts, transitions):
+    __slots__ = ('start', 'accepts', 'transitions', 'tags', '_states', '_compiled')
+
+    def __init__(self, start, accepts, transitions, tags=None):
         self.start = start
         self.accepts = set(accepts)
         self.transitions = transitions
+        # estado -> ranura de captura (2k al entrar al grupo k, 2k+1 al salir)
+        self.tags = tags if tags is not None else {}
+        self._states = None
+        self._compiled = None
 
     def states(self):
-        return set(self.transitions.keys()) | set().union(*[set(v for _, v in lst) for lst in self.transitions.values()]) | self.accepts | {self.start}
+        # Se calcula una sola vez: el NFA no se modifica después de construirse
+        if self._states is None:
+            self._states = set(self.transitions.keys()) | set().union(*[set(v for _, v in lst) for lst in self.transitions.values()]) | self.accepts | {self.start}
+        return self._states
+
+    def compiled(self):
+        """simulaciones.CompiledNFA de este NFA, construido una sola vez"""
+        if self._compiled is None:
+            from simulaciones import CompiledNFA  # Importación diferida: simulaciones importa thompson
+            self._compiled = CompiledNFA(self)
+        return self._compiled
+
+
+class EdgeStore:
+    """
+    Almacén compacto de aristas en arreglos paralelos (origen, símbolo, destino).
+    Los símbolos se internan; el índice 0 siempre es 'ε'. Se usa solo durante
+    la construcción: el NFA resultante guarda únicamente sus transiciones.
+    """
+    __slots__ = ('src', 'sym', 'dst', 'symbols', 'symbol_index')
+
+    def __init__(self):
+        self.src = array('i')
+        self.sym = array('i')
+        self.dst = array('i')
+        self.symbols = ['ε']
+        self.symbol_index = {'ε': 0}
+
+    def add(self, u, symbol, v):
+        idx = self.symbol_index.get(symbol)
+        if idx is None:
+            idx = self.symbol_index[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+        self.src.append(u)
+        self.sym.append(idx)
+        self.dst.append(v)
+
+    def __len__(self):
+        return len(self.src)
+
+    def to_transitions(self) -> dict:
+        trans = {}
+        symbols = self.symbols
+        for u, idx, v in zip(self.src, self.sym, self.dst):
+            add_transition(trans, u, symbols[idx], v)
+        return trans
 
 
 def new_state(counter):
@@ -22,69 +74,110 @@ def add_transition(trans, u, sym, v):
 
 
 def thompson_from_ast(node, counter=None) -> NFA:
+    """
+    Construcción de Thompson iterativa (recorrido postorden con pila).
+    Cada fragmento es un par (inicio, aceptación) y todas las aristas se
+    agregan a un único EdgeStore (convertido una sola vez en transiciones al
+    final), por lo que el costo es lineal en el AST.
+    Los nodos Group agregan un estado de entrada y uno de salida unidos por
+    aristas ε y los registran en nfa.tags; para los demás motores son ε normales.
+    """
     if counter is None:
         counter = [0]
 
-    if node is None:
-        s = new_state(counter)
-        f = new_state(counter)
-        trans = {}
-        add_transition(trans, s, 'ε', f)
-        return NFA(s, {f}, trans)
+    edges = EdgeStore()
+    tags = {}
 
-    if node.left is None and node.right is None:
-        s = new_state(counter)
-        f = new_state(counter)
-        trans = {}
-        add_transition(trans, s, node.value, f)
-        return NFA(s, {f}, trans)
-
-    if node.value == '.':
-        nfa1 = thompson_from_ast(node.left, counter)
-        nfa2 = thompson_from_ast(node.right, counter)
-        trans = {}
-        for t in (nfa1.transitions, nfa2.transitions):
-            for u, lst in t.items():
-                for sym, v in lst:
-                    add_transition(trans, u, sym, v)
-        for a in nfa1.accepts:
-            add_transition(trans, a, 'ε', nfa2.start)
-        return NFA(nfa1.start, nfa2.accepts, trans)
-
-    if node.value == '|':
-        nfaL = thompson_from_ast(node.left, counter)
-        nfaR = thompson_from_ast(node.right, counter)
-        trans = {}
-        for t in (nfaL.transitions, nfaR.transitions):
-            for u, lst in t.items():
-                for sym, v in lst:
-                    add_transition(trans, u, sym, v)
-        s = new_state(counter)
-        f = new_state(counter)
-        add_transition(trans, s, 'ε', nfaL.start)
-        add_transition(trans, s, 'ε', nfaR.start)
-        for a in nfaL.accepts:
-            add_transition(trans, a, 'ε', f)
-        for a in nfaR.accepts:
-            add_transition(trans, a, 'ε', f)
-        return NFA(s, {f}, trans)
-
-    if node.value == '*':
-        nfaA = thompson_from_ast(node.left, counter)
-        trans = {u: lst[:] for u, lst in nfaA.transitions.items()}
+    if node is None:
         s = new_state(counter)
         f = new_state(counter)
-        add_transition(trans, s, 'ε', nfaA.start)
-        add_transition(trans, s, 'ε', f)
-        for a in nfaA.accepts:
-            add_transition(trans, a, 'ε', nfaA.start)
-            add_transition(trans, a, 'ε', f)
-        return NFA(s, {f}, trans)
-
-    raise ValueError(f"Operador no soportado en Thompson: {node.value}")
+        edges.add(s, 'ε', f)
+        return NFA(s, {f}, edges.to_transitions())
+
+    fragments = []
+    stack = [(node, False)]
+    while stack:
+        current, visited = stack.pop()
+
+        if current.left is None and current.right is None:
+            s = new_state(counter)
+            f = new_state(counter)
+            edges.add(s, current.value, f)
+            fragments.append((s, f))
+            continue
+
+        if current.value not in {'.', '|', '*', '+', '?', '()'}:
+            raise ValueError(f"Operador no soportado en Thompson: {current.value}")
+
+        if not visited:
+            # Procesar primero los hijos (izquierdo antes que derecho)
+            stack.append((current, True))
+            if current.right is not None:
+                stack.append((current.right, False))
+            stack.append((current.left, False))
+            continue
+
+        if current.value == '.':
+            s2, f2 = fragments.pop()
+            s1, f1 = fragments.pop()
+            edges.add(f1, 'ε', s2)
+            fragments.append((s1, f2))
+
+        elif current.value == '|':
+            sR, fR = fragments.pop()
+            sL, fL = fragments.pop()
+            s = new_state(counter)
+            f = new_state(counter)
+            edges.add(s, 'ε', sL)
+            edges.add(s, 'ε', sR)
+            edges.add(fL, 'ε', f)
+            edges.add(fR, 'ε', f)
+            fragments.append((s, f))
+
+        elif current.value == '+':
+            sA, fA = fragments.pop()
+            s = new_state(counter)
+            f = new_state(counter)
+            edges.add(s, 'ε', sA)
+            edges.add(fA, 'ε', sA)
+            edges.add(fA, 'ε', f)
+            fragments.append((s, f))
+
+        elif current.value == '()':
+            sA, fA = fragments.pop()
+            s = new_state(counter)
+            f = new_state(counter)
+            edges.add(s, 'ε', sA)
+            edges.add(fA, 'ε', f)
+            tags[s] = 2 * current.index
+            tags[f] = 2 * current.index + 1
+            fragments.append((s, f))
+
+        elif current.value == '?':
+            sA, fA = fragments.pop()
+            s = new_state(counter)
+            f = new_state(counter)
+            edges.add(s, 'ε', sA)
+            edges.add(s, 'ε', f)
+            edges.add(fA, 'ε', f)
+            fragments.append((s, f))
+
+        else:  # '*'
+            sA, fA = fragments.pop()
+            s = new_state(counter)
+            f = new_state(counter)
+            edges.add(s, 'ε', sA)
+            edges.add(s, 'ε', f)
+            edges.add(fA, 'ε', sA)
+            edges.add(fA, 'ε', f)
+            fragments.append((s, f))
+
+    start, accept = fragments.pop()
+    return NFA(start, {accept}, edges.to_transitions(), tags)
 
 
 def draw_nfa(nfa: NFA, filename: str = 'nfa'):
+    from graphviz import Digraph  # Importación diferida: solo al renderizar
     dot = Digraph()
     dot.attr(rankdir='LR')
 
@@ -0,0 +1,87 @@
+import numpy as np
+from dfa import CompiledDFA
+
+DENSE_LIMIT = 1 << 16     # Hasta este código la columna se busca en una tabla directa
+PADDED_CELLS = 1 << 22    # Celdas del arreglo de columnas con relleno por bloque
+
+
+def _column_codes(compiled: CompiledDFA, text: str) -> np.ndarray:
+    """Columna del DFA para cada carácter de text (todas las palabras concatenadas)"""
+    other = compiled.ncols - 1
+    if text.isascii():
+        codes = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+    else:
+        codes = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+    if compiled.classes is not None:
+        starts, names = compiled.classes.boundaries()
+        segment_cols = np.array([other if name is None else compiled.cols.get(name, other) for name in names], dtype=np.int32)
+        if not starts:
+            return np.full(len(codes), other, dtype=np.int32)
+        if starts[-1] >= DENSE_LIMIT:
+            # Búsqueda binaria de cada código entre los cortes de las clases
+            k = np.searchsorted(np.array(starts, dtype=np.int64), codes, side='right') - 1
+            return np.where(k >= 0, segment_cols[np.maximum(k, 0)], other).astype(np.int32)
+        # Tabla directa hasta el último corte; los códigos mayores caen en el último segmento
+        widths = np.diff(np.array(starts + [starts[-1] + 1], dtype=np.intp))
+        lookup = np.concatenate([np.full(starts[0], other, dtype=np.int32), np.repeat(segment_cols, widths)])
+    else:
+        chars = {ch: col for ch, col in compiled.cols.items() if len(ch) == 1}
+        lookup = np.full(max((ord(ch) for ch in chars), default=0) + 2, other, dtype=np.int32)
+        for ch, col in chars.items():
+            lookup[ord(ch)] = col
+    return lookup.take(codes, mode='clip')
+
+
+def _final_states(compiled: CompiledDFA, table: np.ndarray, words: list, lengths: np.ndarray) -> np.ndarray:
+    """
+    Estado final de cada palabra. Las columnas van en un arreglo (longitud
+    máxima × palabras) rellenado con la columna identidad, así que el paso j
+    es states = table[states + cols[j]] sobre todas las palabras.
+    """
+    width = compiled.ncols + 1
+    cols = np.full((int(lengths.max()), len(words)), compiled.ncols, dtype=np.int32)
+    # cols.T recorre las palabras en orden, igual que el texto concatenado
+    cols.T[np.arange(cols.shape[0], dtype=np.int32) < lengths[:, None]] = _column_codes(compiled, ''.join(words))
+    states = np.full(len(words), compiled.start * width, dtype=np.int32)
+    for row in cols:
+        states = table[states + row]
+    return states // width
+
+
+def batch_accepts(dfa, words) -> np.ndarray:
+    """
+    Evalúa muchas palabras a la vez contra un DFA, un carácter de todas las
+    palabras por paso con indexado vectorizado sobre la tabla densa.
+    Si las longitudes son muy dispares, las palabras se ordenan por longitud
+    y se procesan en bloques para acotar el relleno.
+    Devuelve una máscara booleana en el orden de entrada.
+    """
+    compiled = dfa if isinstance(dfa, CompiledDFA) else dfa.compile()
+    words = words if isinstance(words, list) else list(words)
+    if not words:
+        return np.zeros(0, dtype=bool)
+
+    # Tabla con una columna identidad al final (el relleno) y destinos
+    # premultiplicados por el ancho: cada paso es un único índice plano
+    ncols, width = compiled.ncols, compiled.ncols + 1
+    nstates = len(compiled.table) // ncols
+    table = np.empty((nstates, width), dtype=np.int32)
+    table[:, :ncols] = np.frombuffer(compiled.table, dtype=np.int32).reshape(nstates, ncols) * width
+    table[:, ncols] = np.arange(nstates, dtype=np.int32) * width
+    table = table.ravel()
+    accepting = np.frombuffer(compiled.accepting, dtype=np.uint8).astype(bool)
+
+    lengths = np.fromiter(map(len, words), dtype=np.int32, count=len(words))
+    if len(words) * int(lengths.max()) <= 2 * int(lengths.sum()) + PADDED_CELLS:
+        return accepting[_final_states(compiled, table, words, lengths)]
+
+    # Bloques de palabras de longitud parecida, la más larga primero
+    result = np.empty(len(words), dtype=bool)
+    order = np.argsort(-lengths, kind='stable')
+    i = 0
+    while i < len(words):
+        block = order[i:i + max(1, PADDED_CELLS // max(int(lengths[order[i]]), 1))]
+        states = _final_states(compiled, table, [words[k] for k in block.tolist()], lengths[block])
+        result[block] = accepting[states]
+        i += len(block)
+    return result